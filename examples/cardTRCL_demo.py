@@ -0,0 +1,140 @@
+"""
+Examples for the TRCL cell transformation parameter (cardTRCL.TRCLCard).
+
+Run from the repository root:
+
+    python examples/cardTRCL_demo.py
+"""
+import sys
+from pathlib import Path
+
+# The input card modules import each other by module name (e.g. "from cardTR import TRCard")
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src" / "nexa" / "mcnp" / "input"))
+
+from cardTRCL import TRCLCard
+from cardCell import CellCard
+
+
+def main():
+    # Example 1: Reference form
+    print("Example 1: Reference form")
+    trcl1 = TRCLCard.create_reference(1)
+    trcl2 = TRCLCard.create_identity()
+    print(f"Reference TR1: {trcl1}")
+    print(f"Identity: {trcl2}")
+    print(f"Description: {trcl1.get_transformation_description()}")
+    print()
+    
+    # Example 2: Explicit translation
+    print("Example 2: Explicit translation")
+    trcl3 = TRCLCard.create_translation(10.0, 20.0, 30.0)
+    print(f"Translation: {trcl3}")
+    print(f"Description: {trcl3.get_transformation_description()}")
+    print(f"Is translation only: {trcl3.is_translation_only()}")
+    print()
+    
+    # Example 3: Explicit rotation
+    print("Example 3: Explicit rotation")
+    trcl4 = TRCLCard.create_rotation_z(45.0)
+    print(f"Z-rotation: {trcl4}")
+    print(f"Description: {trcl4.get_transformation_description()}")
+    print()
+    
+    # Example 4: Combined transformation
+    print("Example 4: Combined transformation")
+    trcl5 = TRCLCard.create_explicit(
+        displacement=[5.0, 10.0, 15.0],
+        rotation_matrix=[
+            [0.707, -0.707, 0.0],
+            [0.707, 0.707, 0.0],
+            [0.0, 0.0, 1.0]
+        ]
+    )
+    print(f"Combined: {trcl5}")
+    print(f"Description: {trcl5.get_transformation_description()}")
+    print()
+    
+    # Example 5: Using degrees (*TRCL)
+    print("Example 5: Using degrees (*TRCL)")
+    trcl6 = TRCLCard.create_rotation_x(90.0, use_degrees=True)
+    print(f"X-rotation with degrees: {trcl6}")
+    print()
+    
+    # Example 6: Alternative displacement origin
+    print("Example 6: Alternative displacement origin")
+    trcl7 = TRCLCard.create_translation(1.0, 2.0, 3.0, displacement_origin=-1)
+    print(f"Alternative origin: {trcl7}")
+    print(f"Description: {trcl7.get_transformation_description()}")
+    print()
+    
+    # Example 7: Using in cell card context
+    print("Example 7: Cell card usage")
+    # Create a cell with TRCL parameter
+    cell = CellCard(1, material_number=1, density=-1.0, geometry="1 -2 3")
+    
+    # Add TRCL as a parameter (this would need to be integrated into CellCard)
+    trcl_ref = TRCLCard.create_reference(5)
+    trcl_explicit = TRCLCard.create_translation(10.0, 0.0, 0.0)
+    
+    print(f"TRCL reference parameter: {trcl_ref.to_cell_parameter_string()}")
+    print(f"TRCL explicit parameter: {trcl_explicit.to_cell_parameter_string()}")
+    print()
+    
+    # Example 8: Convert to TR card
+    print("Example 8: Convert to TR card")
+    tr_card = trcl5.convert_to_tr_card(10)
+    if tr_card:
+        print(f"Converted TR card: {tr_card}")
+    
+    ref_tr = trcl1.convert_to_tr_card(11)
+    print(f"Reference form conversion: {ref_tr}")
+    print()
+    
+    # Test file writing (example of how it might be used)
+    print("Example cell cards with TRCL:")
+    cell_with_ref = CellCard(10, material_number=1, density=-1.0, geometry="1 -2")
+    cell_with_explicit = CellCard(11, material_number=2, density=-2.0, geometry="3 -4")
+    
+    print(f"Cell 10: {cell_with_ref} {trcl_ref.to_cell_parameter_string()}")
+    print(f"Cell 11: {cell_with_explicit} {trcl_explicit.to_cell_parameter_string()}")
+    print()
+    
+    # Test error handling
+    print("Testing error handling:")
+    try:
+        bad_trcl = TRCLCard.create_reference(-1)  # Invalid reference
+    except ValueError as e:
+        print(f"Caught expected error: {e}")
+    
+    try:
+        bad_trcl = TRCLCard.create_explicit(displacement=[1.0, 2.0])  # Wrong size
+    except ValueError as e:
+        print(f"Caught expected error: {e}")
+    
+    try:
+        bad_trcl = TRCLCard.create_explicit(displacement_origin=2)  # Invalid origin
+    except ValueError as e:
+        print(f"Caught expected error: {e}")
+    
+    # Show convenience methods
+    print("\nConvenience transformations:")
+    print("Reference TR5:", TRCLCard.create_reference(5))
+    print("Identity:", TRCLCard.create_identity())
+    print("X-rotation 90°:", TRCLCard.create_rotation_x(90.0))
+    print("Y-rotation 45°:", TRCLCard.create_rotation_y(45.0))
+    print("Z-rotation 30°:", TRCLCard.create_rotation_z(30.0))
+    print("Translation:", TRCLCard.create_translation(5.0, 10.0, 15.0))
+    
+    print("\nTRCL parameter features:")
+    print("- Reference form: TRCL = n (references TR n card)")
+    print("- Explicit form: TRCL = (o1 o2 o3 xx' yx' zx' xy' yy' zy' xz' yz' zz' m)")
+    print("- Degree notation: *TRCL for angles in degrees")
+    print("- Cell transformations: no limit on transformation numbers")
+    print("- Generated surfaces: original + 1000 × cell_number")
+    print("- Surface number limit: original surfaces < 1000")
+    print("- Cell number limit: ≤ 6 digits")
+    
+
+
+if __name__ == "__main__":
+    main()
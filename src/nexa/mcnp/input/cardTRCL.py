@@ -1,8 +1,21 @@
-from typing import List, Optional, Union, TextIO, Tuple
+from typing import List, Optional, Sequence, Union, TextIO, Tuple
 import math
 from cardTR import TRCard
 
 
+# Entries that MCNP accepts as bare integers; looked up before range formatting
+_EXACT_NUMBERS = {0.0: "0", 1.0: "1", -1.0: "-1"}
+
+# Unrotated matrix; the output paths compare against the matrix itself, since
+# rotation_matrix may be reassigned after construction
+_IDENTITY_MATRIX = [[1.0, 0.0, 0.0], [0.0, 1.0, 0.0], [0.0, 0.0, 1.0]]
+
+# Pre-formatted pieces of the explicit form for the common unrotated/undisplaced cases
+_ZERO_DISPLACEMENT = [0.0, 0.0, 0.0]
+_ZERO_DISPLACEMENT_STR = "0 0 0"
+_IDENTITY_ROTATION_STR = "1 0 0 0 1 0 0 0 1"
+
+
 class TRCLCard:
     """
     Represents an MCNP TRCL (cell coordinate transformation) parameter.
@@ -15,6 +28,10 @@ class TRCLCard:
     positioning universes within container cells.
     """
     
+    __slots__ = ("_use_degrees", "_keyword", "is_reference_form", "transformation_reference",
+                 "displacement", "displacement_origin", "rotation_matrix",
+                 "matrix_specification")
+    
     def __init__(self, transformation_reference: Optional[int] = None,
                  displacement: Optional[List[float]] = None,
                  rotation_matrix: Optional[List[List[float]]] = None,
@@ -38,6 +55,7 @@ class TRCLCard:
             self.displacement = None
             self.rotation_matrix = None
             self.displacement_origin = None
+            self.matrix_specification = None
         else:
             # Explicit form
             self.is_reference_form = False
@@ -47,13 +65,24 @@ class TRCLCard:
             
             # Initialize rotation matrix
             if rotation_matrix is None:
-                self.rotation_matrix = [[1.0, 0.0, 0.0], [0.0, 1.0, 0.0], [0.0, 0.0, 1.0]]
+                self.rotation_matrix = [row.copy() for row in _IDENTITY_MATRIX]
                 self.matrix_specification = "identity"
             else:
                 self.rotation_matrix, self.matrix_specification = self._process_rotation_matrix(rotation_matrix)
             
             self._validate_displacement()
     
+    @property
+    def use_degrees(self) -> bool:
+        """Whether rotation matrix entries are angles in degrees (*TRCL form)."""
+        return self._use_degrees
+    
+    @use_degrees.setter
+    def use_degrees(self, use_degrees: bool) -> None:
+        # The parameter keyword only depends on this flag, so pick it once here
+        self._use_degrees = use_degrees
+        self._keyword = "*TRCL" if use_degrees else "TRCL"
+    
     def _validate_transformation_reference(self, reference: int) -> int:
         """Validate transformation reference number."""
         if not isinstance(reference, int):
@@ -69,14 +98,19 @@ class TRCLCard:
         return origin
     
     def _validate_displacement(self) -> None:
-        """Validate displacement vector."""
-        if not isinstance(self.displacement, list) or len(self.displacement) != 3:
+        """Validate displacement vector (any sequence of 3 numbers: list, tuple, array)."""
+        # a string is iterable too, and "123" would otherwise read as [1.0, 2.0, 3.0]
+        if isinstance(self.displacement, (str, bytes)):
             raise ValueError("Displacement must be a list of 3 numbers")
-        
         try:
-            self.displacement = [float(x) for x in self.displacement]
+            displacement = list(map(float, self.displacement))
         except (ValueError, TypeError):
             raise ValueError("Displacement components must be numeric")
+        
+        if len(displacement) != 3:
+            raise ValueError("Displacement must be a list of 3 numbers")
+        
+        self.displacement = displacement
     
     def _process_rotation_matrix(self, matrix_input: List[List[float]]) -> Tuple[List[List[float]], str]:
         """
@@ -87,6 +121,27 @@ class TRCLCard:
         temp_tr = TRCard(1, rotation_matrix=matrix_input)
         return temp_tr.rotation_matrix, temp_tr.matrix_specification
     
+    @classmethod
+    def _from_complete_matrix(cls, matrix_rows: List[List[float]],
+                              displacement: Optional[List[float]] = None,
+                              displacement_origin: int = 1,
+                              use_degrees: bool = False) -> 'TRCLCard':
+        """
+        Create an explicit TRCL from an already complete 3x3 matrix.
+        
+        Skips the TRCard matrix processing used by __init__; callers must pass
+        three rows of three numbers and a valid displacement origin.
+        """
+        card = cls.__new__(cls)
+        card.use_degrees = use_degrees
+        card.is_reference_form = False
+        card.transformation_reference = None
+        card.displacement = [0.0, 0.0, 0.0] if displacement is None else displacement
+        card.displacement_origin = displacement_origin
+        card.rotation_matrix = [list(map(float, row)) for row in matrix_rows]
+        card.matrix_specification = "complete"
+        return card
+    
     @classmethod
     def create_reference(cls, transformation_number: int, use_degrees: bool = False) -> 'TRCLCard':
         """
@@ -120,6 +175,50 @@ class TRCLCard:
         return cls(displacement=displacement, rotation_matrix=rotation_matrix,
                   displacement_origin=displacement_origin, use_degrees=use_degrees)
     
+    @classmethod
+    def from_batch(cls, params: Sequence[Sequence[float]],
+                   origins: Optional[Sequence[int]] = None,
+                   use_degrees: bool = False) -> List['TRCLCard']:
+        """
+        Create many explicit TRCL parameters from tabulated transformation data.
+        
+        Each row holds the displacement followed by the complete rotation matrix
+        (o1 o2 o3 xx' yx' zx' xy' yy' zy' xz' yz' zz'). The whole table is
+        validated once up front and the per-card matrix processing is skipped,
+        so every row must already be a complete matrix.
+        
+        Args:
+            params: Rows of 12 numbers (list of lists or an (N, 12) array)
+            origins: Displacement origin (1 or -1) for each row (default: all 1)
+            use_degrees: If True, uses *TRCL form
+            
+        Returns:
+            List of TRCLCard in explicit form, one per row
+        """
+        try:
+            rows = [[float(x) for x in row] for row in params]
+        except (ValueError, TypeError):
+            raise ValueError("Transformation parameters must be numeric")
+        
+        if any(len(row) != 12 for row in rows):
+            raise ValueError("Each transformation row must have 12 entries")
+        if not all(math.isfinite(x) for row in rows for x in row):
+            raise ValueError("Transformation parameters must be finite")
+        
+        if origins is None:
+            origins = [1] * len(rows)
+        else:
+            # Checked like _validate_displacement_origin, without converting the values
+            origins = list(origins)
+            if len(origins) != len(rows):
+                raise ValueError("Origins list must have same length as params")
+            if any(origin not in (1, -1) for origin in origins):
+                raise ValueError("Displacement origin must be 1 or -1")
+        
+        return [cls._from_complete_matrix([row[3:6], row[6:9], row[9:12]], displacement=row[:3],
+                                          displacement_origin=origin, use_degrees=use_degrees)
+                for row, origin in zip(rows, origins)]
+    
     @classmethod
     def create_identity(cls) -> 'TRCLCard':
         """Create an identity TRCL parameter (no transformation)."""
@@ -152,7 +251,7 @@ class TRCLCard:
                 [0.0, sin_a, cos_a]
             ]
         
-        return cls.create_explicit(rotation_matrix=rotation_matrix, use_degrees=use_degrees)
+        return cls._from_complete_matrix(rotation_matrix, use_degrees=use_degrees)
     
     @classmethod
     def create_rotation_y(cls, angle_degrees: float, use_degrees: bool = False) -> 'TRCLCard':
@@ -173,7 +272,7 @@ class TRCLCard:
                 [-sin_a, 0.0, cos_a]
             ]
         
-        return cls.create_explicit(rotation_matrix=rotation_matrix, use_degrees=use_degrees)
+        return cls._from_complete_matrix(rotation_matrix, use_degrees=use_degrees)
     
     @classmethod
     def create_rotation_z(cls, angle_degrees: float, use_degrees: bool = False) -> 'TRCLCard':
@@ -194,17 +293,15 @@ class TRCLCard:
                 [0.0, 0.0, 1.0]
             ]
         
-        return cls.create_explicit(rotation_matrix=rotation_matrix, use_degrees=use_degrees)
+        return cls._from_complete_matrix(rotation_matrix, use_degrees=use_degrees)
     
     def is_identity_transformation(self) -> bool:
         """Check if this represents an identity transformation."""
         if self.is_reference_form:
             return self.transformation_reference == 0
         else:
-            identity_matrix = [[1.0, 0.0, 0.0], [0.0, 1.0, 0.0], [0.0, 0.0, 1.0]]
-            zero_displacement = [0.0, 0.0, 0.0]
-            return (self.displacement == zero_displacement and 
-                    self.rotation_matrix == identity_matrix and
+            return (self.displacement == _ZERO_DISPLACEMENT and 
+                    self.is_translation_only() and
                     self.displacement_origin == 1)
     
     def is_translation_only(self) -> bool:
@@ -212,22 +309,30 @@ class TRCLCard:
         if self.is_reference_form:
             return False  # Cannot determine without the referenced TR card
         else:
-            identity_matrix = [[1.0, 0.0, 0.0], [0.0, 1.0, 0.0], [0.0, 0.0, 1.0]]
-            return self.rotation_matrix == identity_matrix
+            return self.rotation_matrix == _IDENTITY_MATRIX
     
     def _format_number(self, value: float) -> str:
         """Format a number for output."""
-        if value == 0.0:
-            return "0"
-        elif value == 1.0:
-            return "1"
-        elif value == -1.0:
-            return "-1"
-        elif abs(value) >= 1e-3 and abs(value) < 1e6:
-            formatted = f"{value:.6f}".rstrip('0').rstrip('.')
-            return formatted
-        else:
-            return f"{value:.6e}"
+        exact = _EXACT_NUMBERS.get(value)
+        if exact is not None:
+            return exact
+        magnitude = abs(value)
+        if 1e-3 <= magnitude < 1e6:
+            return f"{value:.6f}".rstrip('0').rstrip('.')
+        return f"{value:.6e}"
+    
+    def _displacement_values(self) -> str:
+        """Formatted displacement entries of the explicit form."""
+        if self.displacement == _ZERO_DISPLACEMENT:
+            return _ZERO_DISPLACEMENT_STR
+        return " ".join(self._format_number(component) for component in self.displacement)
+    
+    def _rotation_values(self) -> str:
+        """Formatted rotation matrix entries (flattened) of the explicit form."""
+        if self.rotation_matrix == _IDENTITY_MATRIX:
+            return _IDENTITY_ROTATION_STR
+        return " ".join(self._format_number(component)
+                        for row in self.rotation_matrix for component in row)
     
     def to_cell_parameter_string(self) -> str:
         """
@@ -238,30 +343,39 @@ class TRCLCard:
         """
         if self.is_reference_form:
             # Reference form: TRCL = n or *TRCL = n
-            keyword = "*TRCL" if self.use_degrees else "TRCL"
-            return f"{keyword}={self.transformation_reference}"
+            return f"{self._keyword}={self.transformation_reference}"
         else:
             # Explicit form: TRCL = (o1 o2 o3 xx' yx' zx' xy' yy' zy' xz' yz' zz' m)
-            keyword = "*TRCL" if self.use_degrees else "TRCL"
-            
-            components = []
-            
-            # Add displacement vector
-            for component in self.displacement:
-                components.append(self._format_number(component))
-            
-            # Add rotation matrix (flattened)
-            for row in self.rotation_matrix:
-                for component in row:
-                    components.append(self._format_number(component))
-            
-            # Add displacement origin if not default
-            if self.displacement_origin != 1:
-                components.append(str(self.displacement_origin))
-            
-            # Join with spaces and enclose in parentheses
-            parameter_values = " ".join(components)
-            return f"{keyword}=({parameter_values})"
+            # Displacement origin is only written if not default
+            if self.displacement_origin == 1:
+                return f"{self._keyword}=({self._displacement_values()} {self._rotation_values()})"
+            return (f"{self._keyword}=({self._displacement_values()} {self._rotation_values()} "
+                    f"{self.displacement_origin})")
+    
+    def write_to(self, out: TextIO) -> None:
+        """
+        Write the cell parameter form directly to a stream.
+        
+        Produces the same text as to_cell_parameter_string() without building
+        the complete parameter string first, for bulk deck writing.
+        
+        Args:
+            out: Open text stream to write to
+        """
+        if self.is_reference_form:
+            out.write(f"{self._keyword}={self.transformation_reference}")
+            return
+        
+        write = out.write
+        write(self._keyword)
+        write("=(")
+        write(self._displacement_values())
+        write(" ")
+        write(self._rotation_values())
+        if self.displacement_origin != 1:
+            write(" ")
+            write(str(self.displacement_origin))
+        write(")")
     
     def to_string(self) -> str:
         """String representation of the TRCL parameter."""
@@ -304,9 +418,10 @@ class TRCLCard:
         if self.is_reference_form:
             return None
         
+        # TRCard builds its own displacement and matrix lists, so no defensive copies are needed
         return TRCard(transformation_number, 
-                     displacement=self.displacement.copy(),
-                     rotation_matrix=[row.copy() for row in self.rotation_matrix],
+                     displacement=self.displacement,
+                     rotation_matrix=self.rotation_matrix,
                      displacement_origin=self.displacement_origin,
                      use_degrees=self.use_degrees)
     
@@ -326,125 +441,8 @@ class TRCLCard:
                     f"degrees={self.use_degrees})")
 
 
-# Example usage and test functions
+# Example usage (see examples/cardTRCL_demo.py for the full walkthrough)
 if __name__ == "__main__":
-    # Example 1: Reference form
-    print("Example 1: Reference form")
-    trcl1 = TRCLCard.create_reference(1)
-    trcl2 = TRCLCard.create_identity()
-    print(f"Reference TR1: {trcl1}")
-    print(f"Identity: {trcl2}")
-    print(f"Description: {trcl1.get_transformation_description()}")
-    print()
-    
-    # Example 2: Explicit translation
-    print("Example 2: Explicit translation")
-    trcl3 = TRCLCard.create_translation(10.0, 20.0, 30.0)
-    print(f"Translation: {trcl3}")
-    print(f"Description: {trcl3.get_transformation_description()}")
-    print(f"Is translation only: {trcl3.is_translation_only()}")
-    print()
-    
-    # Example 3: Explicit rotation
-    print("Example 3: Explicit rotation")
-    trcl4 = TRCLCard.create_rotation_z(45.0)
-    print(f"Z-rotation: {trcl4}")
-    print(f"Description: {trcl4.get_transformation_description()}")
-    print()
-    
-    # Example 4: Combined transformation
-    print("Example 4: Combined transformation")
-    trcl5 = TRCLCard.create_explicit(
-        displacement=[5.0, 10.0, 15.0],
-        rotation_matrix=[
-            [0.707, -0.707, 0.0],
-            [0.707, 0.707, 0.0],
-            [0.0, 0.0, 1.0]
-        ]
-    )
-    print(f"Combined: {trcl5}")
-    print(f"Description: {trcl5.get_transformation_description()}")
-    print()
-    
-    # Example 5: Using degrees (*TRCL)
-    print("Example 5: Using degrees (*TRCL)")
-    trcl6 = TRCLCard.create_rotation_x(90.0, use_degrees=True)
-    print(f"X-rotation with degrees: {trcl6}")
-    print()
-    
-    # Example 6: Alternative displacement origin
-    print("Example 6: Alternative displacement origin")
-    trcl7 = TRCLCard.create_translation(1.0, 2.0, 3.0, displacement_origin=-1)
-    print(f"Alternative origin: {trcl7}")
-    print(f"Description: {trcl7.get_transformation_description()}")
-    print()
-    
-    # Example 7: Using in cell card context
-    print("Example 7: Cell card usage")
-    from cardCell import CellCard
-    
-    # Create a cell with TRCL parameter
-    cell = CellCard(1, material_number=1, density=-1.0, geometry="1 -2 3")
-    
-    # Add TRCL as a parameter (this would need to be integrated into CellCard)
-    trcl_ref = TRCLCard.create_reference(5)
-    trcl_explicit = TRCLCard.create_translation(10.0, 0.0, 0.0)
-    
-    print(f"TRCL reference parameter: {trcl_ref.to_cell_parameter_string()}")
-    print(f"TRCL explicit parameter: {trcl_explicit.to_cell_parameter_string()}")
-    print()
-    
-    # Example 8: Convert to TR card
-    print("Example 8: Convert to TR card")
-    tr_card = trcl5.convert_to_tr_card(10)
-    if tr_card:
-        print(f"Converted TR card: {tr_card}")
-    
-    ref_tr = trcl1.convert_to_tr_card(11)
-    print(f"Reference form conversion: {ref_tr}")
-    print()
-    
-    # Test file writing (example of how it might be used)
-    print("Example cell cards with TRCL:")
-    cell_with_ref = CellCard(10, material_number=1, density=-1.0, geometry="1 -2")
-    cell_with_explicit = CellCard(11, material_number=2, density=-2.0, geometry="3 -4")
-    
-    print(f"Cell 10: {cell_with_ref} {trcl_ref.to_cell_parameter_string()}")
-    print(f"Cell 11: {cell_with_explicit} {trcl_explicit.to_cell_parameter_string()}")
-    print()
-    
-    # Test error handling
-    print("Testing error handling:")
-    try:
-        bad_trcl = TRCLCard.create_reference(-1)  # Invalid reference
-    except ValueError as e:
-        print(f"Caught expected error: {e}")
-    
-    try:
-        bad_trcl = TRCLCard.create_explicit(displacement=[1.0, 2.0])  # Wrong size
-    except ValueError as e:
-        print(f"Caught expected error: {e}")
-    
-    try:
-        bad_trcl = TRCLCard.create_explicit(displacement_origin=2)  # Invalid origin
-    except ValueError as e:
-        print(f"Caught expected error: {e}")
-    
-    # Show convenience methods
-    print("\nConvenience transformations:")
-    print("Reference TR5:", TRCLCard.create_reference(5))
-    print("Identity:", TRCLCard.create_identity())
-    print("X-rotation 90°:", TRCLCard.create_rotation_x(90.0))
-    print("Y-rotation 45°:", TRCLCard.create_rotation_y(45.0))
-    print("Z-rotation 30°:", TRCLCard.create_rotation_z(30.0))
-    print("Translation:", TRCLCard.create_translation(5.0, 10.0, 15.0))
-    
-    print("\nTRCL parameter features:")
-    print("- Reference form: TRCL = n (references TR n card)")
-    print("- Explicit form: TRCL = (o1 o2 o3 xx' yx' zx' xy' yy' zy' xz' yz' zz' m)")
-    print("- Degree notation: *TRCL for angles in degrees")
-    print("- Cell transformations: no limit on transformation numbers")
-    print("- Generated surfaces: original + 1000 × cell_number")
-    print("- Surface number limit: original surfaces < 1000")
-    print("- Cell number limit: ≤ 6 digits")
-    
\ No newline at end of file
+    print(TRCLCard.create_reference(1))
+    print(TRCLCard.create_rotation_z(30.0))
+    print(TRCLCard.create_translation(10.0, 20.0, 30.0))
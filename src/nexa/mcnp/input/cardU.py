@@ -1,4 +1,57 @@
-from typing import List, Optional, Union, TextIO, Dict, Set
+import functools
+from array import array
+from itertools import compress, groupby, repeat
+from types import MappingProxyType
+from typing import Iterable, Iterator, List, Mapping, Optional, Union, TextIO, Dict, Set, FrozenSet, Tuple
+
+# Data card entries are packed into one int per cell: the universe number in
+# the low 32 bits (universes are at most 99,999,999) and the optimization flag above
+_UNIVERSE_MASK = 0xFFFFFFFF
+_OPTIMIZED_BIT = 1 << 32
+
+# Above this many entries __repr__ summarizes a container instead of sorting it
+_REPR_SORT_LIMIT = 1000
+
+
+def _run_lengths(values: Iterable) -> Tuple[List[int], List]:
+    """
+    Run-length encode a sequence.
+    
+    The scan over the input is itertools.groupby, so it runs in C; Python code
+    only executes once per run.
+    
+    Args:
+        values: Sequence of hashable, comparable values
+        
+    Returns:
+        Tuple of (run lengths, run values) as parallel lists
+    """
+    counts = []
+    run_values = []
+    for value, run in groupby(values):
+        counts.append(len(list(run)))
+        run_values.append(value)
+    return counts, run_values
+
+
+@functools.lru_cache(maxsize=4096)
+def _format_entry(universe: int, optimized: bool) -> str:
+    """Format a universe entry, with the minus sign optimization when flagged."""
+    if optimized and universe != 0:
+        return f"-{universe}"
+    return str(universe)
+
+
+@functools.lru_cache(maxsize=4096)
+def _format_run(count: int, entry: str) -> str:
+    """Format a repeated entry in jump notation."""
+    return f"{count}R {entry}"
+
+
+@functools.lru_cache(maxsize=4096)
+def _format_cell_parameter(universe: int, optimized: bool) -> str:
+    """Format the cell parameter form (U = n) for a universe."""
+    return f"U={_format_entry(universe, optimized)}"
 
 
 class UCard:
@@ -13,11 +66,35 @@ class UCard:
     with up to 20 levels of nesting.
     """
     
+    __slots__ = ("_universe_assignments", "_optimized_cells", "_max_cell_number",
+                 "_max_dirty", "_by_universe", "_cache_str", "_optimized_frozen")
+    
     def __init__(self):
         """Initialize a U card."""
-        self.universe_assignments: Dict[int, int] = {}  # cell_number -> universe_number
-        self.optimized_cells: Set[int] = set()  # cells with minus sign optimization
-        self.max_cell_number = 0
+        self._universe_assignments: Dict[int, int] = {}  # cell_number -> universe_number
+        self._optimized_cells: Set[int] = set()  # cells with minus sign optimization
+        self._max_cell_number = 0
+        self._max_dirty = False  # _max_cell_number may be stale after removals
+        self._by_universe: Optional[Dict[int, Set[int]]] = {}  # universe_number -> cells, None until rebuilt
+        self._cache_str: Optional[Tuple[int, str]] = None  # (line_length, data card string)
+        self._optimized_frozen: Optional[FrozenSet[int]] = None  # snapshot for get_optimized_cells
+    
+    @property
+    def universe_assignments(self) -> Mapping[int, int]:
+        """Read-only view of the universe numbers by cell number."""
+        # The rendered card and the universe index are cached, so changes must
+        # go through set_universe() and the other mutating methods
+        return MappingProxyType(self._universe_assignments)
+    
+    @property
+    def optimized_cells(self) -> FrozenSet[int]:
+        """Cells with the minus sign optimization, as an immutable snapshot."""
+        return self.get_optimized_cells()
+    
+    @property
+    def max_cell_number(self) -> int:
+        """Highest cell number with a universe assignment."""
+        return self.get_max_cell_number()
     
     def set_universe(self, cell_number: int, universe_number: int, optimized: bool = False) -> None:
         """
@@ -28,22 +105,40 @@ class UCard:
             universe_number: Universe number (0 for real world, 1-99,999,999)
             optimized: If True, use minus sign optimization for boundary calculations
         """
-        if not isinstance(cell_number, int) or cell_number < 1:
-            raise ValueError("Cell number must be a positive integer")
-        
-        if not isinstance(universe_number, int):
-            raise ValueError("Universe number must be an integer")
-        
-        if not (0 <= universe_number <= 99999999):
+        # One combined test for the common valid case; the individual checks only
+        # run to pick the error message
+        if not (isinstance(cell_number, int) and isinstance(universe_number, int) and
+                cell_number >= 1 and 0 <= universe_number <= 99999999):
+            if not isinstance(cell_number, int) or cell_number < 1:
+                raise ValueError("Cell number must be a positive integer")
+            
+            if not isinstance(universe_number, int):
+                raise ValueError("Universe number must be an integer")
+            
             raise ValueError("Universe number must be between 0 and 99,999,999")
         
-        self.universe_assignments[cell_number] = universe_number
-        self.max_cell_number = max(self.max_cell_number, cell_number)
+        self._set_universe_unchecked(cell_number, universe_number, optimized)
+    
+    def _set_universe_unchecked(self, cell_number: int, universe_number: int, optimized: bool = False) -> None:
+        """Set universe assignment for a cell whose numbers are already validated."""
+        self._cache_str = None
+        self._optimized_frozen = None
+        by_universe = self._by_universe
+        if by_universe is not None:
+            previous = self._universe_assignments.get(cell_number)
+            if previous is not None:
+                self._discard_from_index(previous, cell_number)
+            by_universe.setdefault(universe_number, set()).add(cell_number)
+        
+        self._universe_assignments[cell_number] = universe_number
+        if cell_number >= self._max_cell_number:
+            self._max_cell_number = cell_number
+            self._max_dirty = False
         
         if optimized:
-            self.optimized_cells.add(cell_number)
-        elif cell_number in self.optimized_cells:
-            self.optimized_cells.remove(cell_number)
+            self._optimized_cells.add(cell_number)
+        elif cell_number in self._optimized_cells:
+            self._optimized_cells.remove(cell_number)
     
     def set_universe_assignments(self, assignments: List[int], optimized_cells: Optional[List[bool]] = None) -> None:
         """
@@ -53,24 +148,35 @@ class UCard:
             assignments: List of universe numbers for cells 1, 2, 3, ...
             optimized_cells: List of optimization flags (True for minus sign)
         """
-        self.universe_assignments.clear()
-        self.optimized_cells.clear()
+        self._universe_assignments.clear()
+        self._optimized_cells.clear()
+        self._by_universe = None  # rebuilt on the next query
+        self._cache_str = None
+        self._optimized_frozen = None
         
         if optimized_cells is not None and len(optimized_cells) != len(assignments):
             raise ValueError("Optimized cells list must have same length as assignments")
         
-        for i, universe_num in enumerate(assignments, 1):
-            if not isinstance(universe_num, int):
-                raise ValueError(f"Universe number for cell {i} must be an integer")
-            if not (0 <= universe_num <= 99999999):
-                raise ValueError(f"Universe number for cell {i} must be between 0 and 99,999,999")
-            
-            self.universe_assignments[i] = universe_num
-            
-            if optimized_cells and optimized_cells[i-1]:
-                self.optimized_cells.add(i)
+        # Validate the whole list with C-level passes; only walk it cell by cell
+        # to report the first offending entry, keeping the cells before it
+        if assignments and not (all(map(isinstance, assignments, repeat(int))) and
+                                0 <= min(assignments) and max(assignments) <= 99999999):
+            for i, universe_num in enumerate(assignments, 1):
+                if not isinstance(universe_num, int):
+                    raise ValueError(f"Universe number for cell {i} must be an integer")
+                if not (0 <= universe_num <= 99999999):
+                    raise ValueError(f"Universe number for cell {i} must be between 0 and 99,999,999")
+                self._universe_assignments[i] = universe_num
+                if optimized_cells and optimized_cells[i - 1]:
+                    self._optimized_cells.add(i)
+        
+        self._universe_assignments.update(enumerate(assignments, 1))
         
-        self.max_cell_number = len(assignments)
+        if optimized_cells:
+            self._optimized_cells.update(compress(range(1, len(assignments) + 1), optimized_cells))
+        
+        self._max_cell_number = len(assignments)
+        self._max_dirty = False
     
     def get_universe(self, cell_number: int) -> Optional[int]:
         """
@@ -82,7 +188,7 @@ class UCard:
         Returns:
             Universe number or None if not assigned
         """
-        return self.universe_assignments.get(cell_number)
+        return self._universe_assignments.get(cell_number)
     
     def is_optimized(self, cell_number: int) -> bool:
         """
@@ -94,7 +200,7 @@ class UCard:
         Returns:
             True if cell is optimized (minus sign)
         """
-        return cell_number in self.optimized_cells
+        return cell_number in self._optimized_cells
     
     def set_optimization(self, cell_number: int, optimized: bool) -> None:
         """
@@ -107,10 +213,12 @@ class UCard:
         if not isinstance(cell_number, int) or cell_number < 1:
             raise ValueError("Cell number must be a positive integer")
         
+        self._cache_str = None
+        self._optimized_frozen = None
         if optimized:
-            self.optimized_cells.add(cell_number)
+            self._optimized_cells.add(cell_number)
         else:
-            self.optimized_cells.discard(cell_number)
+            self._optimized_cells.discard(cell_number)
     
     def remove_universe(self, cell_number: int) -> bool:
         """
@@ -122,37 +230,78 @@ class UCard:
         Returns:
             True if removed, False if not found
         """
-        if cell_number in self.universe_assignments:
-            del self.universe_assignments[cell_number]
-            self.optimized_cells.discard(cell_number)
+        if cell_number in self._universe_assignments:
+            universe_number = self._universe_assignments.pop(cell_number)
+            self._cache_str = None
+            self._optimized_frozen = None
+            self._optimized_cells.discard(cell_number)
+            if self._by_universe is not None:
+                self._discard_from_index(universe_number, cell_number)
             
-            # Update max_cell_number if necessary
-            if cell_number == self.max_cell_number:
-                self.max_cell_number = max(self.universe_assignments.keys()) if self.universe_assignments else 0
+            # Defer the max_cell_number rescan until it is next needed
+            if cell_number == self._max_cell_number:
+                self._max_dirty = True
             return True
         return False
     
     def clear_assignments(self) -> None:
-        """Clear all universe assignments."""
-        self.universe_assignments.clear()
-        self.optimized_cells.clear()
-        self.max_cell_number = 0
+        """Clear all universe assignments, reusing the existing containers."""
+        self._max_cell_number = 0
+        self._max_dirty = False
+        
+        # An already empty card keeps its caches, which are still valid
+        if not self._universe_assignments and not self._optimized_cells:
+            return
+        
+        self._universe_assignments.clear()
+        self._optimized_cells.clear()
+        if self._by_universe is None:
+            self._by_universe = {}
+        else:
+            self._by_universe.clear()
+        self._cache_str = None
+        self._optimized_frozen = None
+    
+    def _discard_from_index(self, universe_number: int, cell_number: int) -> None:
+        """Remove a cell from the universe index, dropping the bucket once it is empty."""
+        cells = self._by_universe[universe_number]
+        cells.discard(cell_number)
+        if not cells:
+            del self._by_universe[universe_number]
+    
+    def _universe_index(self) -> Dict[int, Set[int]]:
+        """Get the universe -> cells index, rebuilding it after a bulk load."""
+        if self._by_universe is None:
+            by_universe = {}
+            for cell, universe in self._universe_assignments.items():
+                cells = by_universe.get(universe)
+                if cells is None:
+                    by_universe[universe] = {cell}
+                else:
+                    cells.add(cell)
+            self._by_universe = by_universe
+        return self._by_universe
     
     def get_all_assignments(self) -> Dict[int, int]:
         """Get a copy of all universe assignments."""
-        return self.universe_assignments.copy()
+        return self._universe_assignments.copy()
     
-    def get_optimized_cells(self) -> Set[int]:
-        """Get a copy of all optimized cell numbers."""
-        return self.optimized_cells.copy()
+    def get_optimized_cells(self) -> FrozenSet[int]:
+        """Get an immutable snapshot of all optimized cell numbers, reused until the card changes."""
+        if self._optimized_frozen is None:
+            self._optimized_frozen = frozenset(self._optimized_cells)
+        return self._optimized_frozen
     
     def get_max_cell_number(self) -> int:
         """Get the maximum cell number with universe assignment."""
-        return self.max_cell_number
+        if self._max_dirty:
+            self._max_cell_number = max(self._universe_assignments) if self._universe_assignments else 0
+            self._max_dirty = False
+        return self._max_cell_number
     
     def has_assignments(self) -> bool:
         """Check if any universe assignments are defined."""
-        return len(self.universe_assignments) > 0
+        return len(self._universe_assignments) > 0
     
     def get_cells_in_universe(self, universe_number: int) -> List[int]:
         """
@@ -162,14 +311,13 @@ class UCard:
             universe_number: Universe number to search for
             
         Returns:
-            List of cell numbers in the universe
+            Sorted list of cell numbers in the universe
         """
-        return [cell for cell, universe in self.universe_assignments.items() 
-                if universe == universe_number]
+        return sorted(self._universe_index().get(universe_number, ()))
     
     def get_used_universes(self) -> Set[int]:
         """Get set of all universe numbers used."""
-        return set(self.universe_assignments.values())
+        return set(self._universe_index())
     
     def is_real_world_cell(self, cell_number: int) -> bool:
         """
@@ -184,96 +332,120 @@ class UCard:
         universe = self.get_universe(cell_number)
         return universe is None or universe == 0
     
-    def _compress_assignments(self, assignment_list: List[int], optimization_list: List[bool]) -> List[str]:
+    def _compress_assignments(self, packed: array) -> List[str]:
         """
         Compress consecutive identical assignments using jump notation.
         
         Args:
-            assignment_list: List of universe assignments
-            optimization_list: List of optimization flags
+            packed: Packed assignments, universe | optimized << 32 per cell
             
         Returns:
             List of strings with jump notation
         """
-        if not assignment_list:
+        if not packed:
             return []
         
-        result = []
-        i = 0
+        # Group consecutive identical packed values, then decode and format one entry per run
+        counts, run_values = _run_lengths(packed)
         
-        while i < len(assignment_list):
-            current_universe = assignment_list[i]
-            current_optimized = optimization_list[i]
-            
-            # Count consecutive identical assignments
-            count = 1
-            while (i + count < len(assignment_list) and 
-                   assignment_list[i + count] == current_universe and
-                   optimization_list[i + count] == current_optimized):
-                count += 1
-            
-            # Format the entry
-            if current_optimized and current_universe != 0:
-                entry = f"-{current_universe}"
-            else:
-                entry = str(current_universe)
+        # Cards usually use only a handful of distinct (universe, optimized) pairs;
+        # decode and format each once, then look entries up by packed value
+        entries = {value: _format_entry(value & _UNIVERSE_MASK, value > _UNIVERSE_MASK)
+                   for value in set(run_values)}
+        
+        # The run count is known at this point, so size the output once
+        result = [None] * len(counts)
+        for i, (count, value) in enumerate(zip(counts, run_values)):
+            entry = entries[value]
             
             # Add jump notation if needed
-            if count == 1:
-                result.append(entry)
-            else:
-                result.append(f"{count}R {entry}")
-            
-            i += count
+            result[i] = entry if count == 1 else _format_run(count, entry)
         
         return result
     
-    def to_data_card_string(self, line_length: int = 80) -> str:
+    def _iter_data_card_lines(self, line_length: int = 80) -> Iterator[str]:
         """
-        Convert to data card form (U n1 n2 ... nJ).
+        Generate the lines of the data card form (U n1 n2 ... nJ).
         
         Args:
             line_length: Maximum line length for formatting
             
-        Returns:
-            Formatted U data card string
+        Yields:
+            Formatted U data card lines, without line terminators
         """
-        if self.max_cell_number == 0:
-            return "u"
-        
-        # Build assignment list from 1 to max_cell_number
-        assignment_list = []
-        optimization_list = []
-        
-        for i in range(1, self.max_cell_number + 1):
-            universe = self.universe_assignments.get(i, 0)  # Default to 0 (real world)
-            optimized = i in self.optimized_cells
+        max_cell_number = self.get_max_cell_number()
+        if max_cell_number == 0:
+            yield "u"
+            return
+        
+        # Every cell assigned to the same universe with no optimization flags
+        # compresses to a single entry, so skip the packing and the scan
+        universes = None
+        if not self._optimized_cells and len(self._universe_assignments) == max_cell_number:
+            universes = set(self._universe_assignments.values())
+        
+        if universes is not None and len(universes) == 1:
+            entry = _format_entry(universes.pop(), False)
+            compressed = [_format_run(max_cell_number, entry) if max_cell_number > 1 else entry]
+        else:
+            # Pack assignments for cells 1 to max_cell_number into one buffer; map() does the
+            # per-cell lookups in C. Unassigned cells default to 0 (real world). The optimization
+            # flags are usually sparse, so they are OR-ed in afterwards
+            packed = array('q', map(self._universe_assignments.get, range(1, max_cell_number + 1), repeat(0)))
+            for cell_number in self._optimized_cells:
+                if cell_number <= max_cell_number:
+                    packed[cell_number - 1] |= _OPTIMIZED_BIT
             
-            assignment_list.append(universe)
-            optimization_list.append(optimized)
-        
-        # Compress using repeat notation
-        compressed = self._compress_assignments(assignment_list, optimization_list)
+            # Compress using repeat notation
+            compressed = self._compress_assignments(packed)
         
-        # Build card
-        components = ["u"] + compressed
-        
-        # Handle line wrapping
-        lines = []
-        current_line = components[0]  # Start with "u"
+        # Handle line wrapping; track the line length instead of re-concatenating the line
+        line_parts = ["u"]
+        current_length = 1
         
         for entry in compressed:
-            if len(current_line + " " + entry) > line_length:
-                lines.append(current_line)
-                current_line = "     " + entry  # Continuation with 5 spaces
+            entry_length = len(entry)
+            if current_length + 1 + entry_length > line_length:
+                yield " ".join(line_parts)
+                line_parts = ["    ", entry]  # Continuation with 5 spaces once joined
+                current_length = 5 + entry_length
             else:
-                current_line += " " + entry
+                line_parts.append(entry)
+                current_length += 1 + entry_length
         
         # Add final line
-        if current_line.strip():
-            lines.append(current_line)
+        yield " ".join(line_parts)
+    
+    def to_data_card_string(self, line_length: int = 80) -> str:
+        """
+        Convert to data card form (U n1 n2 ... nJ).
+        
+        Args:
+            line_length: Maximum line length for formatting
+            
+        Returns:
+            Formatted U data card string
+        """
+        # Reuse the last rendering while the assignments are unchanged
+        cached = self._cache_str
+        if cached is not None and cached[0] == line_length:
+            return cached[1]
+        
+        card = '\n'.join(self._iter_data_card_lines(line_length))
+        self._cache_str = (line_length, card)
+        return card
+    
+    def write_data_card(self, file: TextIO, line_length: int = 80) -> None:
+        """
+        Write the data card form to a file one line at a time.
         
-        return '\n'.join(lines)
+        Args:
+            file: Open file object to write to
+            line_length: Maximum line length for formatting
+        """
+        for line in self._iter_data_card_lines(line_length):
+            file.write(line)
+            file.write('\n')
     
     def to_cell_parameter_string(self, cell_number: int) -> str:
         """
@@ -285,17 +457,12 @@ class UCard:
         Returns:
             Formatted U cell parameter string
         """
-        universe = self.universe_assignments.get(cell_number)
+        universe = self._universe_assignments.get(cell_number)
         
         if universe is None:
             raise ValueError(f"No universe assignment for cell {cell_number}")
         
-        optimized = cell_number in self.optimized_cells
-        
-        if optimized and universe != 0:
-            return f"U=-{universe}"
-        else:
-            return f"U={universe}"
+        return _format_cell_parameter(universe, cell_number in self._optimized_cells)
     
     def to_string(self, line_length: int = 80) -> str:
         """
@@ -317,7 +484,7 @@ class UCard:
             file: Open file object to write to
             line_length: Maximum line length for formatting
         """
-        file.write(self.to_string(line_length) + '\n')
+        self.write_data_card(file, line_length)
     
     def write_cell_parameter_to_file(self, file: TextIO, cell_number: int) -> None:
         """
@@ -329,6 +496,19 @@ class UCard:
         """
         file.write(self.to_cell_parameter_string(cell_number) + '\n')
     
+    def write_all_cell_parameters(self, file: TextIO) -> None:
+        """
+        Write the cell parameter form U specification of every assigned cell to a file.
+        
+        One line per cell, in cell number order, written with a single writelines call.
+        
+        Args:
+            file: Open file object to write to
+        """
+        optimized_cells = self._optimized_cells
+        file.writelines(_format_cell_parameter(universe, cell in optimized_cells) + '\n'
+                        for cell, universe in sorted(self._universe_assignments.items()))
+    
     def validate_hierarchy(self) -> List[str]:
         """
         Validate universe hierarchy for potential issues.
@@ -337,10 +517,16 @@ class UCard:
             List of warning messages
         """
         warnings = []
-        used_universes = self.get_used_universes()
+        
+        # Collect the used universes and the real world cells in one pass
+        used_universes = set()
+        real_world_cells = []
+        for cell, universe in self._universe_assignments.items():
+            used_universes.add(universe)
+            if universe == 0:
+                real_world_cells.append(cell)
         
         # Check for universe 0 assignments (real world)
-        real_world_cells = self.get_cells_in_universe(0)
         if real_world_cells:
             warnings.append(f"Cells {real_world_cells} explicitly assigned to universe 0 (real world)")
         
@@ -350,8 +536,9 @@ class UCard:
             warnings.append(f"Large universe numbers detected: {large_universes}")
         
         # Check optimization on universe 0 cells
-        optimized_real_world = [cell for cell in self.optimized_cells 
-                               if self.get_universe(cell) == 0]
+        assignments = self._universe_assignments
+        optimized_real_world = [cell for cell in self._optimized_cells 
+                               if assignments.get(cell) == 0]
         if optimized_real_world:
             warnings.append(f"Optimization flag on real world cells: {optimized_real_world}")
         
@@ -363,13 +550,23 @@ class UCard:
     
     def __repr__(self) -> str:
         """Developer representation of the U card."""
-        return (f"UCard(assignments={dict(sorted(self.universe_assignments.items()))}, "
-                f"optimized={sorted(self.optimized_cells)}, "
-                f"max_cell={self.max_cell_number})")
+        if len(self._universe_assignments) <= _REPR_SORT_LIMIT:
+            assignments = dict(sorted(self._universe_assignments.items()))
+        else:
+            assignments = f"<{len(self._universe_assignments)} assignments>"
+        
+        if len(self._optimized_cells) <= _REPR_SORT_LIMIT:
+            optimized = sorted(self._optimized_cells)
+        else:
+            optimized = f"<{len(self._optimized_cells)} cells>"
+        
+        return (f"UCard(assignments={assignments}, "
+                f"optimized={optimized}, "
+                f"max_cell={self.get_max_cell_number()})")
     
     def __len__(self) -> int:
         """Return the number of cells with universe assignments."""
-        return len(self.universe_assignments)
+        return len(self._universe_assignments)
 
 
 # Example usage and test functions
@@ -1,4 +1,112 @@
-from typing import List, Optional, TextIO, Union
+import bisect
+import functools
+from itertools import repeat
+from typing import Dict, Iterable, Iterator, List, Optional, Set, TextIO, Union
+
+# Cell lists at least this long whose highest cell is at most _BITMAP_SPAN times
+# their length are stored as a bitmap rather than a set
+_BITMAP_MIN_CELLS = 256
+_BITMAP_SPAN = 4
+
+# Set bit positions of every byte value, for walking a bitmap in order
+_BIT_POSITIONS = tuple(tuple(bit for bit in range(8) if byte >> bit & 1) for byte in range(256))
+
+
+class _CellBitmap:
+    """
+    Set of cell numbers stored as one bit per cell.
+    
+    Used for dense cell ranges (e.g. cells 100-500), where it takes a small
+    fraction of the memory of a set of ints. Supports the set operations
+    VOIDCard needs; iteration yields the cells in ascending order.
+    """
+    
+    __slots__ = ("_bits", "_count")
+    
+    def __init__(self, cells: Iterable[int], max_cell: int):
+        bits = bytearray((max_cell >> 3) + 1)
+        count = 0
+        for cell in cells:
+            bits[cell >> 3] |= 1 << (cell & 7)
+            count += 1
+        self._bits = bits
+        self._count = count
+    
+    def __contains__(self, cell) -> bool:
+        if not isinstance(cell, int) or cell < 0:
+            return False
+        index = cell >> 3
+        return index < len(self._bits) and bool(self._bits[index] >> (cell & 7) & 1)
+    
+    def add(self, cell: int) -> None:
+        if cell in self:
+            return
+        index = cell >> 3
+        if index >= len(self._bits):
+            self._bits.extend(bytes(index + 1 - len(self._bits)))
+        self._bits[index] |= 1 << (cell & 7)
+        self._count += 1
+    
+    def remove(self, cell: int) -> None:
+        if cell not in self:
+            raise KeyError(cell)
+        self._bits[cell >> 3] &= ~(1 << (cell & 7))
+        self._count -= 1
+    
+    def __len__(self) -> int:
+        return self._count
+    
+    def __iter__(self) -> Iterator[int]:
+        for index, byte in enumerate(self._bits):
+            if byte:
+                base = index << 3
+                for bit in _BIT_POSITIONS[byte]:
+                    yield base + bit
+    
+    def __eq__(self, other) -> bool:
+        if isinstance(other, _CellBitmap):
+            return self._count == other._count and self._bits.rstrip(b"\0") == other._bits.rstrip(b"\0")
+        if isinstance(other, (set, frozenset)):
+            return self._count == len(other) and all(map(self.__contains__, other))
+        return NotImplemented
+    
+    __hash__ = None
+
+
+def _compact_cells(cells: Set[int]) -> Union[Set[int], _CellBitmap]:
+    """Return the cells as a bitmap when they cover a dense range, else unchanged."""
+    if len(cells) >= _BITMAP_MIN_CELLS:
+        max_cell = max(cells)
+        if max_cell <= _BITMAP_SPAN * len(cells):
+            return _CellBitmap(cells, max_cell)
+    return cells
+
+
+@functools.lru_cache(maxsize=16384)
+def _cell_str(cell_number: int) -> str:
+    """Format a cell number, sharing the string across renders."""
+    return str(cell_number)
+
+
+def _validated_cells(cell_numbers: List[int]) -> Set[int]:
+    """
+    Validate a non-empty list of cell numbers and return its distinct cells.
+    
+    The type check, deduplication and bound check are each one C-level pass;
+    the bound check runs over the deduplicated set rather than the raw list.
+    
+    Args:
+        cell_numbers: List of cell numbers
+        
+    Returns:
+        Set of distinct cell numbers
+    """
+    if not all(map(isinstance, cell_numbers, repeat(int))):
+        raise ValueError("Cell numbers must be positive integers")
+    cells = set(cell_numbers)
+    if min(cells) <= 0:
+        raise ValueError("Cell numbers must be positive integers")
+    return cells
 
 
 class VOIDCard:
@@ -10,6 +118,8 @@ class VOIDCard:
     calculating volumes stochastically.
     """
     
+    __slots__ = ("_void_all", "_cells", "_sorted", "_str_cache")
+    
     def __init__(self, cell_numbers: Optional[Union[int, List[int]]] = None):
         """
         Initialize a VOID card.
@@ -20,29 +130,61 @@ class VOIDCard:
                 - int: Single cell number to void
                 - List[int]: List of cell numbers to void
         """
+        # Cells are stored as a set (or a bitmap for dense ranges) for O(1)
+        # add/remove/membership; the sorted list is built lazily when the card
+        # is rendered or listed
+        self._cells: Union[Set[int], _CellBitmap] = set()  # Empty means void all cells
+        self._sorted: Optional[List[int]] = []
+        self._str_cache: Dict[int, str] = {}  # line_length -> rendered card, cleared on change
+        self._void_all = True
+        
         if cell_numbers is None:
-            self.cell_numbers = []  # Empty list means void all cells
             self.void_all = True
         elif isinstance(cell_numbers, int):
             if cell_numbers <= 0:
                 raise ValueError("Cell numbers must be positive integers")
-            self.cell_numbers = [cell_numbers]
+            self._cells.add(cell_numbers)
+            self._sorted = None
             self.void_all = False
         elif isinstance(cell_numbers, list):
             if not cell_numbers:
                 # Empty list same as None
-                self.cell_numbers = []
                 self.void_all = True
             else:
-                for cell_num in cell_numbers:
-                    if not isinstance(cell_num, int) or cell_num <= 0:
-                        raise ValueError("Cell numbers must be positive integers")
-                # Remove duplicates and sort
-                self.cell_numbers = sorted(list(set(cell_numbers)))
+                # Validate and remove duplicates
+                self._cells = _compact_cells(_validated_cells(cell_numbers))
+                self._sorted = None
                 self.void_all = False
         else:
             raise ValueError("cell_numbers must be None, int, or List[int]")
     
+    @property
+    def void_all(self) -> bool:
+        """Whether the card voids all cells (blank VOID card)."""
+        return self._void_all
+    
+    @void_all.setter
+    def void_all(self, void_all: bool) -> None:
+        self._void_all = void_all
+        self._str_cache.clear()
+    
+    @property
+    def cell_numbers(self) -> List[int]:
+        """Sorted list of the voided cell numbers, as a copy."""
+        return self._sorted_cells().copy()
+    
+    @cell_numbers.setter
+    def cell_numbers(self, cell_numbers: List[int]) -> None:
+        self._cells = set(cell_numbers)
+        self._sorted = None
+        self._str_cache.clear()
+    
+    def _sorted_cells(self) -> List[int]:
+        """Get the internal sorted cell list, building it if needed; callers must not modify it."""
+        if self._sorted is None:
+            self._sorted = sorted(self._cells)
+        return self._sorted
+    
     def set_void_all_cells(self) -> None:
         """
         Set the card to void all cells (blank VOID card).
@@ -51,7 +193,9 @@ class VOIDCard:
         FM cards are turned off, heating tallies become flux tallies, and
         NPS 100000 is effectively applied if no NPS card exists.
         """
-        self.cell_numbers = []
+        self._cells = set()
+        self._sorted = []
+        self._str_cache.clear()
         self.void_all = True
     
     def set_specific_cells(self, cell_numbers: List[int]) -> None:
@@ -65,12 +209,10 @@ class VOIDCard:
             self.set_void_all_cells()
             return
         
-        for cell_num in cell_numbers:
-            if not isinstance(cell_num, int) or cell_num <= 0:
-                raise ValueError("Cell numbers must be positive integers")
-        
-        # Remove duplicates and sort
-        self.cell_numbers = sorted(list(set(cell_numbers)))
+        # Validate and remove duplicates
+        self._cells = _compact_cells(_validated_cells(cell_numbers))
+        self._sorted = None
+        self._str_cache.clear()
         self.void_all = False
     
     def add_cell(self, cell_number: int) -> None:
@@ -85,11 +227,21 @@ class VOIDCard:
         
         if self.void_all:
             # Convert from void_all to specific cells
-            self.cell_numbers = [cell_number]
+            self._cells = {cell_number}
+            self._sorted = [cell_number]
+            self._str_cache.clear()
             self.void_all = False
-        elif cell_number not in self.cell_numbers:
-            self.cell_numbers.append(cell_number)
-            self.cell_numbers.sort()
+        elif cell_number not in self._cells:
+            if (isinstance(self._cells, _CellBitmap) and
+                    cell_number > _BITMAP_SPAN * (len(self._cells) + 1)):
+                # The bitmap would mostly cover cells that are not voided
+                self._cells = set(self._cells)
+            self._cells.add(cell_number)
+            self._str_cache.clear()
+            # Keep an already built sorted list in order with a binary-search
+            # insert rather than re-sorting it on the next render
+            if self._sorted is not None:
+                bisect.insort(self._sorted, cell_number)
     
     def remove_cell(self, cell_number: int) -> bool:
         """
@@ -105,11 +257,13 @@ class VOIDCard:
             # Cannot remove from void_all - would need to specify all other cells
             return False
         
-        try:
-            self.cell_numbers.remove(cell_number)
+        if cell_number in self._cells:
+            self._cells.remove(cell_number)
+            self._str_cache.clear()
+            if self._sorted is not None:
+                del self._sorted[bisect.bisect_left(self._sorted, cell_number)]
             return True
-        except ValueError:
-            return False
+        return False
     
     def clear_cells(self) -> None:
         """Clear all specific cells (resulting in void all behavior)."""
@@ -117,7 +271,7 @@ class VOIDCard:
     
     def get_cell_numbers(self) -> List[int]:
         """Get a copy of the cell numbers list."""
-        return self.cell_numbers.copy()
+        return self.cell_numbers
     
     def is_void_all(self) -> bool:
         """Check if the card voids all cells (blank card)."""
@@ -125,11 +279,11 @@ class VOIDCard:
     
     def has_specific_cells(self) -> bool:
         """Check if the card specifies specific cells to void."""
-        return not self.void_all and len(self.cell_numbers) > 0
+        return not self.void_all and len(self._cells) > 0
     
     def is_empty(self) -> bool:
         """Check if the card has no effect (no cells specified)."""
-        return not self.void_all and len(self.cell_numbers) == 0
+        return not self.void_all and len(self._cells) == 0
     
     def contains_cell(self, cell_number: int) -> bool:
         """
@@ -143,11 +297,11 @@ class VOIDCard:
         """
         if self.void_all:
             return True
-        return cell_number in self.cell_numbers
+        return cell_number in self._cells
     
     def get_num_cells(self) -> int:
         """Get the number of specifically listed cells."""
-        return len(self.cell_numbers)
+        return len(self._cells)
     
     def to_string(self, line_length: int = 80) -> str:
         """
@@ -167,25 +321,51 @@ class VOIDCard:
             # This shouldn't happen in normal usage, but handle it
             return "void"
         
-        lines = []
-        current_line = "void"
+        # Reuse the rendering while the cells are unchanged
+        cached = self._str_cache.get(line_length)
+        if cached is not None:
+            return cached
+        
+        card = '\n'.join(self._iter_lines(line_length))
+        self._str_cache[line_length] = card
+        return card
+    
+    def _iter_lines(self, line_length: int = 80) -> Iterator[str]:
+        """
+        Generate the lines of the VOID card.
+        
+        Args:
+            line_length: Maximum line length for formatting
+            
+        Yields:
+            Formatted VOID card lines, without line terminators
+        """
+        if self.void_all or self.is_empty():
+            # Blank VOID card
+            yield "void"
+            return
+        
+        # Only the line length is tracked per cell; each line is joined once
+        # from a slice of the formatted cell numbers
+        cell_strs = list(map(_cell_str, self._sorted_cells()))
+        head = "void"
+        line_start = 0
+        current_length = 4
         
         # Add cell numbers
-        for cell_num in self.cell_numbers:
-            cell_str = f" {cell_num}"
+        for i, cell_str in enumerate(cell_strs):
             
             # Check if adding this cell would exceed line length
-            if len(current_line + cell_str) > line_length:
-                lines.append(current_line)
-                current_line = "     " + str(cell_num)  # Continuation line with 5 spaces
+            if current_length + 1 + len(cell_str) > line_length:
+                yield " ".join([head, *cell_strs[line_start:i]])
+                head = "    "  # Continuation line with 5 spaces once joined
+                line_start = i
+                current_length = 5 + len(cell_str)
             else:
-                current_line += cell_str
+                current_length += 1 + len(cell_str)
         
         # Add the final line
-        if current_line.strip():
-            lines.append(current_line)
-        
-        return '\n'.join(lines)
+        yield " ".join([head, *cell_strs[line_start:]])
     
     def write_to_file(self, file: TextIO, line_length: int = 80) -> None:
         """
@@ -195,7 +375,9 @@ class VOIDCard:
             file: Open file object to write to
             line_length: Maximum line length for formatting
         """
-        file.write(self.to_string(line_length) + '\n')
+        for line in self._iter_lines(line_length):
+            file.write(line)
+            file.write('\n')
     
     def __str__(self) -> str:
         """String representation of the VOID card."""
@@ -206,17 +388,21 @@ class VOIDCard:
         if self.void_all:
             return "VOIDCard(void_all=True)"
         else:
-            return f"VOIDCard(cell_numbers={self.cell_numbers})"
+            return f"VOIDCard(cell_numbers={self._sorted_cells()})"
     
     def __eq__(self, other) -> bool:
         """Check equality with another VOIDCard."""
+        if self is other:
+            return True
         if not isinstance(other, VOIDCard):
+            return NotImplemented
+        if self.void_all != other.void_all or len(self._cells) != len(other._cells):
             return False
-        return self.void_all == other.void_all and self.cell_numbers == other.cell_numbers
+        return self._cells == other._cells
     
     def __len__(self) -> int:
         """Return the number of specifically listed cells."""
-        return len(self.cell_numbers)
+        return len(self._cells)
 
 
 # Example usage and test functions
@@ -1,4 +1,29 @@
-from typing import List, Optional, Union, TextIO, Dict
+import functools
+import operator
+from itertools import groupby
+from types import MappingProxyType
+from typing import Iterator, List, Mapping, Optional, Union, TextIO, Dict
+
+# groupby key separating unspecified (None) volumes from values, evaluated in C
+_is_none = functools.partial(operator.is_, None)
+
+# Above this many volumes __repr__ shows a summary instead of the sorted mapping
+_REPR_SORT_LIMIT = 32
+
+
+@functools.lru_cache(maxsize=4096)
+def _fmt_vol(volume: float) -> str:
+    """Format a volume, as an integer when it has no fractional part."""
+    # is_integer() tests the fraction directly instead of building an int to compare against
+    if float(volume).is_integer():
+        return str(int(volume))
+    return f"{volume:.6g}"
+
+
+@functools.lru_cache(maxsize=4096)
+def _jump_str(jump_count: int) -> str:
+    """Format a jump entry covering jump_count cells."""
+    return "J" if jump_count == 1 else f"{jump_count}J"
 
 
 class VOLCard:
@@ -11,6 +36,8 @@ class VOLCard:
     unspecified volumes.
     """
     
+    __slots__ = ("_no_calculation", "_volumes", "_max_cell_number", "_max_dirty", "_str_cache")
+    
     def __init__(self, no_calculation: bool = False):
         """
         Initialize a VOL card.
@@ -18,9 +45,33 @@ class VOLCard:
         Args:
             no_calculation: If True, includes NO keyword to bypass volume calculations
         """
-        self.no_calculation = no_calculation
-        self.volumes: Dict[int, Optional[float]] = {}  # cell_number -> volume (None for unspecified)
-        self.max_cell_number = 0
+        self._no_calculation = no_calculation
+        self._volumes: Dict[int, Optional[float]] = {}  # cell_number -> volume (None for unspecified)
+        self._max_cell_number = 0
+        self._max_dirty = False  # _max_cell_number may be stale after removals
+        self._str_cache: Dict[int, str] = {}  # line_length -> rendered data card, cleared on change
+    
+    @property
+    def no_calculation(self) -> bool:
+        """Whether the NO keyword bypasses volume calculations."""
+        return self._no_calculation
+    
+    @no_calculation.setter
+    def no_calculation(self, no_calculation: bool) -> None:
+        self._no_calculation = no_calculation
+        self._str_cache.clear()
+    
+    @property
+    def volumes(self) -> Mapping[int, Optional[float]]:
+        """Read-only view of the volumes by cell number (None for unspecified)."""
+        # The rendered card is cached, so changes must go through set_volume()
+        # and the other methods that clear the cache
+        return MappingProxyType(self._volumes)
+    
+    @property
+    def max_cell_number(self) -> int:
+        """Highest cell number covered by the card."""
+        return self.get_max_cell_number()
     
     def set_volume(self, cell_number: int, volume: Optional[float]) -> None:
         """
@@ -40,8 +91,11 @@ class VOLCard:
                 raise ValueError("Volume must be non-negative")
             volume = float(volume)
         
-        self.volumes[cell_number] = volume
-        self.max_cell_number = max(self.max_cell_number, cell_number)
+        self._volumes[cell_number] = volume
+        if cell_number >= self._max_cell_number:
+            self._max_cell_number = cell_number
+            self._max_dirty = False
+        self._str_cache.clear()
     
     def set_volumes(self, volumes: List[Optional[float]]) -> None:
         """
@@ -50,17 +104,22 @@ class VOLCard:
         Args:
             volumes: List of volumes (None for unspecified cells)
         """
-        self.volumes.clear()
+        self._volumes.clear()
+        self._str_cache.clear()
+        
+        # Only specified volumes are stored; unspecified cells below
+        # max_cell_number are rendered as jumps from the missing keys
         for i, volume in enumerate(volumes, 1):
-            if volume is not None:
-                if not isinstance(volume, (int, float)):
-                    raise ValueError(f"Volume for cell {i} must be numeric or None")
-                if volume < 0:
-                    raise ValueError(f"Volume for cell {i} must be non-negative")
-                volume = float(volume)
-            self.volumes[i] = volume
+            if volume is None:
+                continue
+            if not isinstance(volume, (int, float)):
+                raise ValueError(f"Volume for cell {i} must be numeric or None")
+            if volume < 0:
+                raise ValueError(f"Volume for cell {i} must be non-negative")
+            self._volumes[i] = float(volume)
         
-        self.max_cell_number = len(volumes)
+        self._max_cell_number = len(volumes)
+        self._max_dirty = False
     
     def get_volume(self, cell_number: int) -> Optional[float]:
         """
@@ -72,7 +131,7 @@ class VOLCard:
         Returns:
             Volume value or None if unspecified
         """
-        return self.volumes.get(cell_number)
+        return self._volumes.get(cell_number)
     
     def remove_volume(self, cell_number: int) -> bool:
         """
@@ -84,30 +143,36 @@ class VOLCard:
         Returns:
             True if removed, False if not found
         """
-        if cell_number in self.volumes:
-            del self.volumes[cell_number]
-            # Update max_cell_number if necessary
-            if cell_number == self.max_cell_number:
-                self.max_cell_number = max(self.volumes.keys()) if self.volumes else 0
+        if cell_number in self._volumes:
+            del self._volumes[cell_number]
+            self._str_cache.clear()
+            # Defer the max_cell_number rescan until it is next needed
+            if cell_number == self._max_cell_number:
+                self._max_dirty = True
             return True
         return False
     
     def clear_volumes(self) -> None:
         """Clear all volume specifications."""
-        self.volumes.clear()
-        self.max_cell_number = 0
+        self._volumes.clear()
+        self._max_cell_number = 0
+        self._max_dirty = False
+        self._str_cache.clear()
     
     def get_all_volumes(self) -> Dict[int, Optional[float]]:
         """Get a copy of all volume specifications."""
-        return self.volumes.copy()
+        return self._volumes.copy()
     
     def get_max_cell_number(self) -> int:
         """Get the maximum cell number with volume specification."""
-        return self.max_cell_number
+        if self._max_dirty:
+            self._max_cell_number = max(self._volumes) if self._volumes else 0
+            self._max_dirty = False
+        return self._max_cell_number
     
     def has_volumes(self) -> bool:
         """Check if any volumes are specified."""
-        return len(self.volumes) > 0
+        return len(self._volumes) > 0
     
     def set_no_calculation(self, no_calculation: bool) -> None:
         """Set whether to bypass volume calculations."""
@@ -127,29 +192,48 @@ class VOLCard:
             return []
         
         result = []
-        i = 0
-        
-        while i < len(volume_list):
-            if volume_list[i] is None:
-                # Count consecutive None values
-                jump_count = 0
-                while i < len(volume_list) and volume_list[i] is None:
-                    jump_count += 1
-                    i += 1
-                
+        
+        # Split the list into runs of unspecified and specified volumes
+        for is_jump, run in groupby(volume_list, _is_none):
+            if is_jump:
                 # Add jump notation
-                if jump_count == 1:
-                    result.append("J")
-                else:
-                    result.append(f"{jump_count}J")
+                result.append(_jump_str(len(list(run))))
             else:
-                # Add the volume value
-                volume = volume_list[i]
-                if volume == int(volume):
-                    result.append(str(int(volume)))
-                else:
-                    result.append(f"{volume:.6g}")
-                i += 1
+                # Add the volume values
+                result.extend(map(_fmt_vol, run))
+        
+        return result
+    
+    def _compress_sparse(self, max_cell_number: int) -> List[str]:
+        """
+        Build the jump-compressed entries from the specified cells alone.
+        
+        The gaps between consecutive specified cells become the jumps, so the
+        cost follows the number of volumes rather than max_cell_number.
+        
+        Args:
+            max_cell_number: Last cell covered by the card
+            
+        Returns:
+            List of strings with jump notation
+        """
+        result = []
+        volumes = self._volumes
+        previous = 0
+        
+        for cell in sorted(volumes):
+            if cell > max_cell_number:
+                break
+            volume = volumes[cell]
+            if volume is None:
+                continue
+            if cell - previous > 1:
+                result.append(_jump_str(cell - previous - 1))
+            result.append(_fmt_vol(volume))
+            previous = cell
+        
+        if max_cell_number > previous:
+            result.append(_jump_str(max_cell_number - previous))
         
         return result
     
@@ -163,16 +247,43 @@ class VOLCard:
         Returns:
             Formatted VOL data card string
         """
-        if self.max_cell_number == 0 and not self.no_calculation:
+        if self.get_max_cell_number() == 0 and not self.no_calculation:
             return "vol"
         
-        # Build volume list from 1 to max_cell_number
-        volume_list = []
-        for i in range(1, self.max_cell_number + 1):
-            volume_list.append(self.volumes.get(i))
+        # Reuse the rendering while the volumes are unchanged
+        cached = self._str_cache.get(line_length)
+        if cached is not None:
+            return cached
         
-        # Compress jumps
-        compressed = self._compress_jumps(volume_list)
+        card = '\n'.join(self._iter_lines(line_length))
+        self._str_cache[line_length] = card
+        return card
+    
+    def _iter_lines(self, line_length: int = 80) -> Iterator[str]:
+        """
+        Generate the lines of the data card form (VOL [NO] x1 x2 ... xJ).
+        
+        Args:
+            line_length: Maximum line length for formatting
+            
+        Yields:
+            Formatted VOL data card lines, without line terminators
+        """
+        max_cell_number = self.get_max_cell_number()
+        if max_cell_number == 0 and not self.no_calculation:
+            yield "vol"
+            return
+        
+        if 2 * len(self._volumes) < max_cell_number:
+            # Mostly jumps: emit the gaps between specified cells directly
+            compressed = self._compress_sparse(max_cell_number)
+        else:
+            # Build volume list from 1 to max_cell_number; map() does the per-cell
+            # lookups in C. Unspecified cells come back as None
+            volume_list = list(map(self._volumes.get, range(1, max_cell_number + 1)))
+            
+            # Compress jumps
+            compressed = self._compress_jumps(volume_list)
         
         # Build card
         components = ["vol"]
@@ -183,24 +294,26 @@ class VOLCard:
         
         # Handle line wrapping
         if not compressed:
-            return " ".join(components[:2])  # Just "vol" or "vol no"
+            yield " ".join(components[:2])  # Just "vol" or "vol no"
+            return
         
-        lines = []
-        current_line = " ".join(components[:2])  # "vol" or "vol no"
+        # Track the line length instead of re-concatenating the line
+        header = " ".join(components[:2])  # "vol" or "vol no"
+        line_parts = [header]
+        current_length = len(header)
         
         # Add volume entries with wrapping
         for entry in compressed:
-            if len(current_line + " " + entry) > line_length:
-                lines.append(current_line)
-                current_line = "     " + entry  # Continuation with 5 spaces
+            if current_length + 1 + len(entry) > line_length:
+                yield " ".join(line_parts)
+                line_parts = ["    ", entry]  # Continuation with 5 spaces once joined
+                current_length = 5 + len(entry)
             else:
-                current_line += " " + entry
+                line_parts.append(entry)
+                current_length += 1 + len(entry)
         
         # Add final line
-        if current_line.strip():
-            lines.append(current_line)
-        
-        return '\n'.join(lines)
+        yield " ".join(line_parts)
     
     def to_cell_card_string(self, cell_number: int) -> str:
         """
@@ -212,15 +325,12 @@ class VOLCard:
         Returns:
             Formatted VOL cell card string for the specified cell
         """
-        volume = self.volumes.get(cell_number)
+        volume = self._volumes.get(cell_number)
         
         if volume is None:
             raise ValueError(f"No volume specified for cell {cell_number}")
         
-        if volume == int(volume):
-            return f"vol {int(volume)}"
-        else:
-            return f"vol {volume:.6g}"
+        return f"vol {_fmt_vol(volume)}"
     
     def to_string(self, line_length: int = 80) -> str:
         """
@@ -242,7 +352,9 @@ class VOLCard:
             file: Open file object to write to
             line_length: Maximum line length for formatting
         """
-        file.write(self.to_string(line_length) + '\n')
+        for line in self._iter_lines(line_length):
+            file.write(line)
+            file.write('\n')
     
     def write_cell_card_to_file(self, file: TextIO, cell_number: int) -> None:
         """
@@ -260,13 +372,17 @@ class VOLCard:
     
     def __repr__(self) -> str:
         """Developer representation of the VOL card."""
+        if len(self._volumes) > _REPR_SORT_LIMIT:
+            return (f"VOLCard(no_calculation={self.no_calculation}, "
+                    f"entries={len(self._volumes)}, "
+                    f"max_cell={self.get_max_cell_number()})")
         return (f"VOLCard(no_calculation={self.no_calculation}, "
-                f"volumes={dict(sorted(self.volumes.items()))}, "
-                f"max_cell={self.max_cell_number})")
+                f"volumes={dict(sorted(self._volumes.items()))}, "
+                f"max_cell={self.get_max_cell_number()})")
     
     def __len__(self) -> int:
         """Return the number of cells with volume specifications."""
-        return len(self.volumes)
+        return len(self._volumes)
 
 
 # Example usage and test functions
@@ -1,17 +1,58 @@
-from .table010 import Table010Parser
-from .table040 import Table040Parser, IsotopeComposition, MaterialComposition
-from .table050 import Table050Parser, CellVolumeData, SurfaceAreaData
-from .table060 import Table060Parser, CellData, TableTotals
-from .table100 import Table100Parser, IsotopeData, CrossSectionFile
-from .table101 import Table101Parser, ParticleEnergyLimit
-from .table102 import Table102Parser, SABAssignment
-from .table110 import Table110Parser, ParticlePoint, SourceParticle
-from .table126 import Table126Parser, NeutronActivity, NeutronActivityTotal
-from .table130 import Table130Parser, EventData, VarianceReductionData, PhysicalEventsData, CellWeightBalance, WeightBalanceTotals
-from .table140 import Table140Parser, NuclideActivity, CellActivity, TableTotals
-from .table175 import Table175Parser, EstimatorData, CombinationData, CycleData, SkippedCycleData
-from .table210 import Table210Parser, NeutronicsData, MaterialBurnupData, NuclideInventoryData, InventoryTotals, MaterialInventory
-from .table220 import Table220Parser, SummaryNuclideData, SummaryTotals, SummaryInventory
-from .output import MCNPOutputParser, MCNPOutputKeff
-from .mctal import MctalParser, MctalOverview
+import importlib
+import warnings
 
+# Public name -> submodule defining it. Parser modules are imported on first
+# attribute access (PEP 562) so importing the package stays cheap.
+_EXPORTS = {
+    "Table010Parser": ".table010",
+    "Table040Parser": ".table040", "IsotopeComposition": ".table040", "MaterialComposition": ".table040",
+    "Table050Parser": ".table050", "CellVolumeData": ".table050", "SurfaceAreaData": ".table050",
+    "Table060Parser": ".table060", "CellData": ".table060", "Table060Totals": ".table060",
+    "Table100Parser": ".table100", "IsotopeData": ".table100", "CrossSectionFile": ".table100",
+    "Table101Parser": ".table101", "ParticleEnergyLimit": ".table101",
+    "Table102Parser": ".table102", "SABAssignment": ".table102",
+    "Table110Parser": ".table110", "ParticlePoint": ".table110", "SourceParticle": ".table110",
+    "Table126Parser": ".table126", "NeutronActivity": ".table126", "NeutronActivityTotal": ".table126",
+    "Table130Parser": ".table130", "EventData": ".table130", "VarianceReductionData": ".table130",
+    "PhysicalEventsData": ".table130", "CellWeightBalance": ".table130", "WeightBalanceTotals": ".table130",
+    "Table140Parser": ".table140", "NuclideActivity": ".table140", "CellActivity": ".table140",
+    "Table140Totals": ".table140",
+    "Table175Parser": ".table175", "EstimatorData": ".table175", "CombinationData": ".table175",
+    "CycleData": ".table175", "SkippedCycleData": ".table175",
+    "Table210Parser": ".table210", "NeutronicsData": ".table210", "MaterialBurnupData": ".table210",
+    "NuclideInventoryData": ".table210", "InventoryTotals": ".table210", "MaterialInventory": ".table210",
+    "Table220Parser": ".table220", "SummaryNuclideData": ".table220", "SummaryTotals": ".table220",
+    "SummaryInventory": ".table220",
+    "MCNPOutputParser": ".output", "MCNPOutputKeff": ".output",
+    "MctalParser": ".mctal", "MctalOverview": ".mctal",
+}
+
+# table060 and table140 both define a class named TableTotals; they are
+# re-exported under distinct names
+_RENAMED = {
+    "Table060Totals": "TableTotals",
+    "Table140Totals": "TableTotals",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name == "TableTotals":
+        # The eager imports used to leave the table140 class bound to this name
+        warnings.warn("nexa.mcnp.output.TableTotals is deprecated; use Table060Totals "
+                      "or Table140Totals", DeprecationWarning, stacklevel=2)
+        value = __getattr__("Table140Totals")
+        globals()[name] = value
+        return value
+    
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), _RENAMED.get(name, name))
+    globals()[name] = value  # later lookups skip __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS))
@@ -1,12 +1,19 @@
-import re
 import sys
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import Dict, List, Self, Tuple
+from typing import Callable, Dict, Iterable, List, Self, Tuple
+
+import numpy as np
 
 from nexa.mcnp.data import McnpParticleType, McnpParticleTypes, McnpTallyBinEnum
 from nexa.util import MultiDimIterator
 
+# tally header particle flag (bits for n, p, e; ipt = bit + 1) -> particles
+_PARTICLE_BITMASK = {
+    mask: tuple(McnpParticleTypes.particle_by_ipt(i + 1) for i in range(3) if mask & (1 << i))
+    for mask in range(8)
+}
+
 
 class LookFor(Enum):
     """Enumeration for parsing state."""
@@ -43,10 +50,14 @@ class DetectorType(Enum):
     def parse(cls, det_type: int) -> Self:
         """Convert integer to DetectorType enum."""
 
-        for member in cls:
-            if det_type == member.value[0]:
-                return member
-        raise ValueError(f"Unknown detector type: {det_type}")
+        try:
+            return cls._BY_INT[det_type]
+        except KeyError:
+            raise ValueError(f"Unknown detector type: {det_type}") from None
+
+
+# mctal value -> member, built once for parse()
+DetectorType._BY_INT = {member.value[0]: member for member in DetectorType}
 
 
 class TallyModifierType(Enum):
@@ -61,13 +72,17 @@ class TallyModifierType(Enum):
     def parse(cls, mod_type: int) -> Self:
         """Convert integer to TallyModifierType enum."""
 
-        for member in cls:
-            if mod_type == member.value[0]:
-                return member
-        raise ValueError(f"Unknown tally modifier type: {mod_type}")
+        try:
+            return cls._BY_INT[mod_type]
+        except KeyError:
+            raise ValueError(f"Unknown tally modifier type: {mod_type}") from None
+
+
+# mctal value -> member, built once for parse()
+TallyModifierType._BY_INT = {member.value[0]: member for member in TallyModifierType}
 
 
-@dataclass
+@dataclass(slots=True)
 class MctalTally:
     """Represents an MCNP tally in MCTAL file"""
 
@@ -76,13 +91,22 @@ class MctalTally:
     detector_type: DetectorType = DetectorType.NONE
     modifier_type: TallyModifierType = TallyModifierType.NONE
     # tuple is (McnpTallyBinEnum, bin count, bin qual, bin data)
-    bin: Dict[str, Tuple[Enum, int, str, List[int | float]]] = field(default_factory=dict)
+    # bin data is an int64 or float64 array for bins that carry values, else an empty list
+    bin: Dict[str, Tuple[Enum, int, str, List | np.ndarray]] = field(default_factory=dict)
     fc_data: List[str] = field(default_factory=list)
-    # tuple is (value, uncertainty)
-    vals_data: List[Tuple[float, float]] = field(default_factory=list)
+    # VALS data as parallel columns: value and relative uncertainty
+    vals: np.ndarray = field(default_factory=lambda: np.empty(0))
+    errs: np.ndarray = field(default_factory=lambda: np.empty(0))
     # tuple is (nps, mean, error, fom)
     tfc_data: List[Tuple[int, float, float, float]] = field(default_factory=list)
     tfc_bin: Tuple[int, int, int, int, int, int, int, int] = field(default_factory=tuple)
+    # VALS layout derived from bin, built by _finalize() once parsing is complete
+    _shape: Tuple[int, ...] = field(default=None, init=False, repr=False, compare=False)
+    _strides: Tuple[int, ...] = field(default=None, init=False, repr=False, compare=False)
+    # generated coordinate builders keyed by (free, fixed) layout
+    _coord_fns: Dict[tuple, Callable] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
 
     def total_vals(self) -> int:
         """Calculate total number of bins across all bin types."""
@@ -91,32 +115,61 @@ class MctalTally:
             total *= bin_tuple[1] if bin_tuple[1] > 0 else 1
         return total
 
+    def _finalize(self) -> None:
+        """Cache the bin counts (shape) and strides of the VALS data, last bin fastest."""
+        shape = tuple(max(bin_tuple[1], 1) for bin_tuple in self.bin.values())
+        strides = [1] * len(shape)
+        for i in range(len(shape) - 2, -1, -1):
+            strides[i] = strides[i + 1] * shape[i + 1]
+        self._shape = shape
+        self._strides = tuple(strides)
+
+    def _layout(self) -> Tuple[Tuple[int, ...], Tuple[int, ...]]:
+        """Return the cached (shape, strides), finalizing tallies built outside the parser."""
+        if self._shape is None or len(self._shape) != len(self.bin):
+            self._finalize()
+        return self._shape, self._strides
+
     def value(self, indices: Tuple[int, int, int, int, int, int, int, int]) -> Tuple[float, float]:
         """Get value and uncertainty for given bin indices.
 
         indices: List of indices corresponding to each bin type in order of bin dict
         """
-        if not self.vals_data:
+        if len(self.vals) == 0:
             raise RuntimeError("No VALS data available for this tally")
 
         if len(indices) != len(self.bin):
             raise ValueError("Number of indices does not match number of bin types")
 
-        # Calculate flat index
+        # Calculate flat index from the cached strides
+        shape, strides = self._layout()
         flat_index = 0
-        multiplier = 1
-        bin_keys = list(self.bin.keys())
-        for i in reversed(range(len(bin_keys))):
-            bin_key = bin_keys[i]
-            bin_tuple = self.bin[bin_key]
-            bin_count = 1 if bin_tuple[1] == 0 else bin_tuple[1]
-            index = indices[i]
+        for bin_key, index, bin_count, stride in zip(self.bin, indices, shape, strides):
             if index < 0 or index >= bin_count:
                 raise IndexError(f"Index {index} out of range for bin {bin_key}")
-            flat_index += index * multiplier
-            multiplier *= bin_count
+            flat_index += index * stride
+
+        # item() hands back Python floats without building NumPy scalars first
+        return self.vals.item(flat_index), self.errs.item(flat_index)
 
-        return self.vals_data[flat_index]
+    def values(self, coords: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Get values and uncertainties for a batch of bin indices.
+
+        coords: (N, number of bin types) array, each row ordered like the bin dict
+        """
+        if len(self.vals) == 0:
+            raise RuntimeError("No VALS data available for this tally")
+
+        coords = np.asarray(coords, dtype=np.intp)
+        if coords.ndim != 2 or coords.shape[1] != len(self.bin):
+            raise ValueError("Number of indices does not match number of bin types")
+
+        shape, _ = self._layout()
+        try:
+            flat_indices = np.ravel_multi_index(coords.T, shape)
+        except ValueError:
+            raise IndexError("Index out of range in bin coordinates") from None
+        return self.vals.take(flat_indices), self.errs.take(flat_indices)
 
     def iterator(self) -> MultiDimIterator:
         """Get MultiDimIterator for iterating over VALS data."""
@@ -126,6 +179,30 @@ class MctalTally:
 
         return MultiDimIterator(sizes)
 
+    def compiled_coord_fn(
+        self, free: List[str], fixed: Dict[str, int]
+    ) -> Callable[..., Tuple[int, ...]]:
+        """Get a function building full bin coordinates from the free indices.
+
+        The function takes one index per entry of free (in that order) and returns the
+        coordinate tuple in order of bin dict, with the fixed indices baked in. It is
+        generated once per (free, fixed) layout and cached.
+        """
+        if isinstance(free, str):
+            free = [free]
+        key = (tuple(free), tuple(sorted(fixed.items())))
+        coord_fn = self._coord_fns.get(key)
+        if coord_fn is None:
+            self.iterator()._validate_inputs(free, fixed)
+            args = [f"i{n}" for n in range(len(free))]
+            by_key = dict(zip(free, args))
+            items = [by_key.get(bin_key, str(int(fixed.get(bin_key, 0)))) for bin_key in self.bin]
+            source = f"def coord({', '.join(args)}):\n    return ({', '.join(items)},)\n"
+            namespace = {}
+            exec(source, namespace)
+            coord_fn = self._coord_fns[key] = namespace["coord"]
+        return coord_fn
+
     def __str__(self) -> str:
         return (
             f"MctalTally {self.tally_num}:\n"
@@ -134,13 +211,13 @@ class MctalTally:
             f"  Modifier Type: {self.modifier_type.name}\n"
             f"  Bins: { {k: (v[1], v[2]) for k, v in self.bin.items()} }\n"
             f"  FC Data Lines: {len(self.fc_data)}\n"
-            f"  VALS Data Entries: {len(self.vals_data)}\n"
+            f"  VALS Data Entries: {len(self.vals)}\n"
             f"  TFC Data Entries: {len(self.tfc_data)}\n"
             f"  TFC Bin: {self.tfc_bin}"
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class MctalOverview:
     """Represents contents of MCTAL file"""
 
@@ -179,11 +256,18 @@ class MctalParser:
 
     def parse_lines(self, lines: List[str]) -> MctalOverview:
         """Parse MCNP MCTAL file"""
+        return self.parse_iter(lines)
+
+    def parse_iter(self, line_iter: Iterable[str]) -> MctalOverview:
+        """Parse MCNP MCTAL file from any iterable of lines, e.g. an open file.
+
+        Lines are consumed one at a time so the file never has to be held in memory.
+        """
 
         lf: LookFor = LookFor.HEAD
         lfHead: LookFor = LookFor.HEAD_HEADER
 
-        for line in lines:
+        for line in line_iter:
             # don't strip line since leading spaces are important
             if lf == LookFor.HEAD:
                 if lfHead == LookFor.HEAD_HEADER:
@@ -242,6 +326,59 @@ class MctalParser:
                     continue
 
             if lf == LookFor.TALLY:
+                # data rows make up nearly all of a MCTAL file, so the VALS and bin data
+                # states are tested before the once-per-tally header states
+                if lfTally == LookFor.TALLY_VALS:
+                    # ex: "vals"
+                    if vals_read == 0 and line.startswith("vals"):
+                        continue
+                    # ex: "  3.00000E+09 0.5774  9.70000E+10 0.1015  1.34000E+11 0.0877  1.93000E+11 0.0724"
+                    if vals_read < expected:
+                        num_parts = len(line.split())
+                        if num_parts % 2 != 0:
+                            raise RuntimeError("Invalid VALS data line in MCTAL tally")
+                        # only count pairs here, the text is converted in one pass below
+                        vals_text.append(line)
+                        vals_read += num_parts // 2
+                    if vals_read == expected:
+                        # Finished reading VALS data
+                        vals = np.fromstring(" ".join(vals_text), dtype=np.float64, sep=" ")
+                        if vals.size != 2 * expected:
+                            raise RuntimeError("Invalid VALS data value in MCTAL tally")
+                        self._current_tally.vals = vals[0::2].copy()
+                        self._current_tally.errs = vals[1::2].copy()
+                        lfTally = LookFor.TALLY_TFC
+                    if vals_read > expected:
+                        raise RuntimeError("Too many VALS data values in MCTAL tally")
+                    continue
+
+                if lfTally == LookFor.TALLY_BIN_DATA:
+                    # ex: "      1      2      3      4      5      6      7"
+                    # Read bin data lines
+                    if values_read < expected:
+                        bin_text.append(line)
+                        values_read += len(line.split())
+                    if values_read == expected:
+                        # Finished reading bin data, convert the block in one pass;
+                        # integers (cell numbers) unless any value is written as a float
+                        text = " ".join(bin_text)
+                        is_float = "." in text or "e" in text or "E" in text
+                        data = np.fromstring(
+                            text, dtype=np.float64 if is_float else np.int64, sep=" "
+                        )
+                        if data.size != expected:
+                            raise RuntimeError("Invalid bin data value in MCTAL tally")
+                        bin_tuple = (bin_type, bin_count, bin_qual, data)
+                        self._current_tally.bin[bin_key] = bin_tuple
+                        if bin_type == McnpTallyBinEnum.T:
+                            expected = self._current_tally.total_vals()
+                            lfTally = LookFor.TALLY_VALS
+                        else:
+                            lfTally = LookFor.TALLY_BIN
+                    if values_read > expected:
+                        raise RuntimeError("Too many bin data values in MCTAL tally")
+                    continue
+
                 if lfTally == LookFor.TALLY_HEAD:
                     # ex: "tally    1                   -1    0    0"
                     parts = line.split()
@@ -257,16 +394,13 @@ class MctalParser:
                             detector_type=tally_det_type,
                             modifier_type=tally_modifier,
                         )
+                        vals_read = 0
+                        vals_text: List[str] = []
                         # Check if particles can be determined from tally_particle or if on next line
                         if tally_particle > 0:
-                            particles: List[McnpParticleType] = []
-                            num = tally_particle
-                            for i in range(3):
-                                if num % 2 == 1:
-                                    # some magic here since ipt for n, p, e = i+1
-                                    particles.append(McnpParticleTypes.particle_by_ipt(i + 1))
-                                num = num // 2
-                            self._current_tally.particles = particles
+                            self._current_tally.particles = list(
+                                _PARTICLE_BITMASK[tally_particle & 0b111]
+                            )
                             lfTally = LookFor.TALLY_FC
                         else:
                             # read the particle string on next line
@@ -310,18 +444,29 @@ class MctalParser:
                 if lfTally == LookFor.TALLY_BIN:
                     # ex: "f        7"
                     # Process bin lines
-                    bin_match = re.match(r"([fdusmcet])([tu\s])\s+(\d+)", line)
-                    if bin_match:
-                        bin_key = bin_match.group(1).upper()
+                    # plain character tests instead of a regex: bin letter, qualifier
+                    # (t, u or blank), whitespace, then the bin count
+                    count_field = ""
+                    if (
+                        len(line) > 3
+                        and line[0] in "fdusmcet"
+                        and line[1] in "tu \t"
+                        and line[2].isspace()
+                    ):
+                        count_field = line[2:].lstrip().partition(" ")[0].rstrip()
+                    if count_field.isdigit():
+                        bin_key = line[0].upper()
                         bin_type = McnpTallyBinEnum[bin_key]
-                        bin_qual = bin_match.group(2).strip()
-                        bin_count = int(bin_match.group(3))
+                        bin_qual = line[1].strip()
+                        bin_count = int(count_field)
                         bin_tuple = (bin_type, bin_count, bin_qual, [])
                     else:
                         raise RuntimeError(f"Invalid MCTAL {bin_key} line")
                     # Need to handle bin F when detector tally since no F data - NYI
                     if bin_count != 0 and McnpTallyBinEnum.has_mctal_data(bin_type):
                         expected = bin_count - 1 if bin_qual == "t" else bin_count
+                        values_read = 0
+                        bin_text: List[str] = []
                         lfTally = LookFor.TALLY_BIN_DATA
                     elif bin_type == McnpTallyBinEnum.T:
                         self._current_tally.bin[bin_key] = bin_tuple
@@ -333,52 +478,6 @@ class MctalParser:
                         self._current_tally.bin[bin_key] = bin_tuple
                     continue
 
-                if lfTally == LookFor.TALLY_BIN_DATA:
-                    # ex: "      1      2      3      4      5      6      7"
-                    # Read bin data lines
-                    values_read = len(bin_tuple[3])
-                    if values_read < expected:
-                        parts = line.strip().split()
-                        for part in parts:
-                            if "." in part or "e" in part.lower():
-                                bin_tuple[3].append(float(part))
-                            else:
-                                bin_tuple[3].append(int(part))
-                    values_read = len(bin_tuple[3])
-                    if values_read == expected:
-                        # Finished reading bin data
-                        self._current_tally.bin[bin_key] = bin_tuple
-                        if bin_type == McnpTallyBinEnum.T:
-                            expected = self._current_tally.total_vals()
-                            lfTally = LookFor.TALLY_VALS
-                        else:
-                            lfTally = LookFor.TALLY_BIN
-                    if values_read > expected:
-                        raise RuntimeError("Too many bin data values in MCTAL tally")
-                    continue
-
-                if lfTally == LookFor.TALLY_VALS:
-                    # ex: "vals"
-                    if len(self._current_tally.vals_data) == 0 and line.startswith("vals"):
-                        continue
-                    # ex: "  3.00000E+09 0.5774  9.70000E+10 0.1015  1.34000E+11 0.0877  1.93000E+11 0.0724"
-                    if len(self._current_tally.vals_data) < expected:
-                        parts = line.strip().split()
-                        if len(parts) % 2 != 0:
-                            raise RuntimeError("Invalid VALS data line in MCTAL tally")
-                        i = 0
-                        while i < len(parts):
-                            val = float(parts[i])
-                            err = float(parts[i + 1]) if (i + 1) < len(parts) else 0.0
-                            self._current_tally.vals_data.append((val, err))
-                            i += 2
-                    if len(self._current_tally.vals_data) == expected:
-                        # Finished reading VALS data
-                        lfTally = LookFor.TALLY_TFC
-                    if len(self._current_tally.vals_data) > expected:
-                        raise RuntimeError("Too many VALS data values in MCTAL tally")
-                    continue
-
                 if lfTally == LookFor.TALLY_TFC:
                     # ex: "tfc   10       1       1       1       1       1       2     253       1"
                     if line.startswith("tfc"):
@@ -391,9 +490,9 @@ class MctalParser:
                         else:
                             raise RuntimeError("Invalid TFC header line in MCTAL tally")
                     # ex: "       10000000  3.91204E+15  2.50865E-02  4.43250E+01"
-                    elif re.match(r"\s*\d+", line):
+                    elif (stripped := line.lstrip()) and stripped[0].isdigit():
                         if itfc < ntfc:
-                            parts = line.strip().split()
+                            parts = stripped.split()
                             if len(parts) != 4:
                                 raise RuntimeError("Invalid TFC data line in MCTAL tally")
                             # nps, mean, error, fom
@@ -410,6 +509,7 @@ class MctalParser:
                             itfc += 1
                         if itfc == ntfc:
                             # Finished reading TFC data
+                            self._current_tally._finalize()
                             self._overview.tallies[self._current_tally.tally_num] = (
                                 self._current_tally
                             )
@@ -431,9 +531,7 @@ if __name__ == "__main__":
 
     for file in sys.argv[1:]:
         try:
-            with open(file, "r", encoding="utf-8") as f:
-                print(f"Processing file: {file}")
-                lines = f.readlines()
+            f = open(file, "r", encoding="utf-8")
         except FileNotFoundError:
             print(f"File not found: {file}")
             sys.exit(1)
@@ -442,13 +540,15 @@ if __name__ == "__main__":
             sys.exit(1)
 
         parser = MctalParser()
-        mctal: MctalOverview = parser.parse_lines(lines)
+        with f:
+            print(f"Processing file: {file}")
+            mctal: MctalOverview = parser.parse_iter(f)
         mctal.case = file
         print(mctal)
         for tal_num in mctal.tally_nums:
             tal = mctal.tallies.get(tal_num, None)
             if tal:
-                print(f"Tally {tal.tally_num} has {len(tal.vals_data)} VALS entries")
+                print(f"Tally {tal.tally_num} has {len(tal.vals)} VALS entries")
                 print(f"value at tfc bin {tal.tfc_bin}: {tal.value(tal.tfc_bin)}")
 
         # 'F', 'D', 'U', 'S', 'M', 'C', 'E', 'T'
@@ -461,11 +561,13 @@ if __name__ == "__main__":
             it = tal.iterator()
             # for coord in it.iter_coords(free, fixed, format="tuple"):
             #     print(f"{coord}: {tal.value(coord)}\n")
-            iter_gen = it.iter_coords(free, fixed, format="tuple")
+            coords = np.array(list(it.iter_coords(free, fixed, format="tuple")))
+            vals, errs = tal.values(coords)
+            num_f = it.sizes["F"]
             for c in range(it.sizes["C"]):
-                for f in range(it.sizes["F"]):
-                    coord = next(iter_gen)
-                    print(f"{tal.value(coord)[0]:10.6e} {tal.value(coord)[1]:.4f} ", end="")
+                row = slice(c * num_f, (c + 1) * num_f)
+                for val, err in zip(vals[row], errs[row]):
+                    print(f"{val:10.6e} {err:.4f} ", end="")
                 print()
 
     # print(DetectorType.parse(0))
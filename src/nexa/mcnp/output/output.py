@@ -1,9 +1,36 @@
 from dataclasses import dataclass
+import mmap
+import os
 import re
 from pathlib import Path
-from typing import Dict, List, Optional, Union
+from typing import Dict, Iterator, List, Optional, Tuple, Union
 
-@dataclass
+# The output is scanned in blocks of whole lines, each lowercased once, so the patterns
+# are case-sensitive lowercase bytes. That lets re use its literal-prefix search;
+# IGNORECASE patterns, or one alternation of all of them, fall back to trying every
+# position and were 10-20x slower on large outputs. No match spans a line.
+_BLOCK_SIZE = 1 << 22
+_CYCLES_RE = re.compile(rb'run terminated when\s+(\d+)\s+kcode cycles were done')
+_TALLY_RE = re.compile(rb'1tally\s+(\d+)[^\n]*?nps\s*=\s*(\d+)')
+_WARNING_RE = re.compile(rb'warning\..*')
+_ERROR_RE = re.compile(rb'fatal error\..*')
+# criticality summary lines, by kind
+_CRITICALITY_RES = (
+    ("keff", re.compile(
+        rb'the final estimated combined collision/absorption/track-length keff = ([\d.]+) '
+        rb'with an estimated standard deviation of ([\d.]+)')),
+    ("life", re.compile(
+        rb'the final combined \(col/abs/tl\) prompt removal lifetime = ([\d.e+-]+) seconds '
+        rb'with an estimated standard deviation of ([\d.e+-]+)')),
+    ("anecf", re.compile(rb'the average neutron energy causing fission = ([\d.e+-]+) mev')),
+    ("ealf", re.compile(
+        rb'the energy corresponding to the average neutron lethargy causing fission = '
+        rb'([\d.e+-]+) mev')),
+    ("nubar", re.compile(rb'the average number of neutrons produced per fission = ([\d.e+-]+)')),
+)
+
+
+@dataclass(slots=True)
 class MCNPOutputKeff:
     """Data class to hold k-effective related information."""
     keff: float
@@ -32,19 +59,46 @@ class MCNPOutputParser:
             filepath: Path to the MCNP output file
         """
         self.filepath = Path(filepath)
-        self.content = ""
+        self.content = b""
         self.parsed_data = {}
+        self._parsed = False
+        # results of the scans answering queries before parse(); None until computed
+        self._summary: Optional[Tuple[bool, bool, int]] = None
+        self._has_errors: Optional[bool] = None
+        self._has_warnings: Optional[bool] = None
         
+    def _clear_scans(self) -> None:
+        """Forget the results of the scans made before parse()."""
+        self._summary = None
+        self._has_errors = None
+        self._has_warnings = None
+    
     def read_file(self) -> None:
-        """Read the output file content."""
+        """Map the output file content into memory (read-only bytes)."""
+        self._clear_scans()
         try:
-            with open(self.filepath, 'r', encoding='utf-8') as f:
-                self.content = f.read()
+            with open(self.filepath, 'rb') as f:
+                # mmap cannot map an empty file
+                if os.fstat(f.fileno()).st_size:
+                    self.content = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                else:
+                    self.content = b""
         except FileNotFoundError:
             raise FileNotFoundError(f"Output file not found: {self.filepath}")
         except Exception as e:
             raise Exception(f"Error reading file: {e}")
     
+    def close(self) -> None:
+        """Release the memory map of the output file; parse() maps it again if needed."""
+        # bytes content (an empty file) has no close()
+        close = getattr(getattr(self, 'content', None), 'close', None)
+        if close is not None:
+            close()
+        self.content = b""
+    
+    def __del__(self):
+        self.close()
+    
     def parse(self) -> Dict:
         """Parse the MCNP output file and extract key information.
         
@@ -54,111 +108,87 @@ class MCNPOutputParser:
         if not self.content:
             self.read_file()
             
-        self.parsed_data = {
-            'run_info': self._parse_run_info(),
-            'tallies': self._parse_tallies(),
-            'criticality': self._parse_criticality(),
-            'warnings': self._parse_warnings(),
-            'errors': self._parse_errors()
-        }
+        self.parsed_data = self._scan_output()
+        self._parsed = True
+        self._clear_scans()
         
         return self.parsed_data
     
-    def _parse_run_info(self) -> Dict:
-        """Parse basic run information."""
-        run_info = {}
-        
-        # Extract run time
-        time_match = re.search(r'run terminated when\s+(\d+)\s+kcode cycles were done', self.content, re.IGNORECASE)
-        if time_match:
-            run_info['cycles'] = int(time_match.group(1))
-            
-        return run_info
+    def _iter_blocks(self) -> Iterator[Tuple[bytes, bytes]]:
+        """Yield (block, lowercased block) pairs covering the content in whole lines."""
+        content = self.content
+        size = len(content)
+        start = 0
+        while start < size:
+            end = content.find(b"\n", min(start + _BLOCK_SIZE, size))
+            end = size if end < 0 else end + 1
+            block = content[start:end]
+            yield block, block.lower()
+            start = end
     
-    def _parse_tallies(self) -> Dict:
-        """Parse tally results."""
+    def _scan_output(self) -> Dict:
+        """Collect run info, tallies, criticality, warnings and errors block by block."""
+        run_info = {}
         tallies = {}
+        criticality_values = {kind: [] for kind, _ in _CRITICALITY_RES}
+        # message -> number of times it was printed; MCNP repeats many warnings verbatim
+        warnings: Dict[str, int] = {}
+        errors: Dict[str, int] = {}
         
-        # Find tally sections
-        tally_pattern = r'1tally\s+(\d+).*?nps\s*=\s*(\d+)'
-        matches = re.finditer(tally_pattern, self.content, re.DOTALL | re.IGNORECASE)
-        
-        for match in matches:
-            tally_num = match.group(1)
-            tallies[f'tally_{tally_num}'] = {
-                'number': tally_num,
-                'nps': int(match.group(2))
-            }
+        for block, lower in self._iter_blocks():
+            # run time: first occurrence only
+            if 'cycles' not in run_info:
+                time_match = _CYCLES_RE.search(lower)
+                if time_match:
+                    run_info['cycles'] = int(time_match.group(1))
             
-        return tallies
-    
-    def _parse_criticality(self) -> List[MCNPOutputKeff]:
-        """Parse criticality calculations (k-effective, etc.)."""
-        criticality = []
-        self.nkeff = 0
-        # Parse k-effective
-        keff_pattern = r'the final estimated combined collision/absorption/track-length keff = ([\d.]+) with an estimated standard deviation of ([\d.]+)'
-        keff_matches = re.finditer(keff_pattern, self.content, re.DOTALL | re.IGNORECASE)
-        
-        for match in keff_matches:
-            criticality.append(MCNPOutputKeff(
-                keff=float(match.group(1)),
-                keff_sd=float(match.group(2))
-            ))
+            for match in _TALLY_RE.finditer(lower):
+                tally_num = match.group(1).decode()
+                tallies[f'tally_{tally_num}'] = {
+                    'number': tally_num,
+                    'nps': int(match.group(2))
+                }
             
-        # Parse lifetime
-        life_pattern = r'the final combined \(col/abs/tl\) prompt removal lifetime = ([\d.Ee+-]+) seconds with an estimated standard deviation of ([\d.Ee+-]+)'
-        life_matches = re.finditer(life_pattern, self.content, re.DOTALL | re.IGNORECASE)
-        
-        for (i, match) in enumerate(life_matches):
-            criticality[i].lifetime = float(match.group(1))
-            criticality[i].lifetime_sd = float(match.group(2))
-
-        # Parse anecf
-        anecf_pattern = r'the average neutron energy causing fission = ([\d.Ee+-]+) mev'
-        anecf_matches = re.finditer(anecf_pattern, self.content, re.DOTALL | re.IGNORECASE)
-        
-        for (i, match) in enumerate(anecf_matches):
-            criticality[i].anecf = float(match.group(1))
-
-        # Parse ealf
-        ealf_pattern = r'the energy corresponding to the average neutron lethargy causing fission = ([\d.Ee+-]+) mev'
-        ealf_matches = re.finditer(ealf_pattern, self.content, re.DOTALL | re.IGNORECASE)
-        
-        for (i, match) in enumerate(ealf_matches):
-            criticality[i].ealf = float(match.group(1))
-
-        # Parse nubar
-        nubar_pattern = r'the average number of neutrons produced per fission = ([\d.Ee+-]+)'
-        nubar_matches = re.finditer(nubar_pattern, self.content, re.DOTALL | re.IGNORECASE)
+            for kind, pattern in _CRITICALITY_RES:
+                criticality_values[kind].extend(pattern.findall(lower))
+            
+            # messages keep the case they were written in
+            for match in _WARNING_RE.finditer(lower):
+                message = block[match.start():match.end()].strip().decode('utf-8')
+                warnings[message] = warnings.get(message, 0) + 1
+            for match in _ERROR_RE.finditer(lower):
+                message = block[match.start():match.end()].strip().decode('utf-8')
+                errors[message] = errors.get(message, 0) + 1
         
-        for (i, match) in enumerate(nubar_matches):
-            criticality[i].nubar = float(match.group(1))
-            self.nkeff += 1
-
-        return criticality
+        return {
+            'run_info': run_info,
+            'tallies': tallies,
+            'criticality': self._build_criticality(criticality_values),
+            'warnings': warnings,
+            'errors': errors
+        }
     
-    def _parse_warnings(self) -> List[str]:
-        """Parse warning messages."""
-        warnings = []
-        warning_pattern = r'warning\..*'
-        matches = re.finditer(warning_pattern, self.content, re.IGNORECASE)
+    def _build_criticality(self, values: Dict[str, list]) -> List[MCNPOutputKeff]:
+        """Build criticality results (k-effective, etc.) from the captured values.
         
-        for match in matches:
-            warnings.append(match.group(0).strip())
-            
-        return warnings
-    
-    def _parse_errors(self) -> List[str]:
-        """Parse error messages."""
-        errors = []
-        error_pattern = r'fatal error\..*'
-        matches = re.finditer(error_pattern, self.content, re.IGNORECASE)
+        The n-th lifetime, anecf, ealf and nubar found belong to the n-th k-effective.
+        """
+        criticality = [
+            MCNPOutputKeff(keff=float(keff), keff_sd=float(keff_sd))
+            for keff, keff_sd in values["keff"]
+        ]
+        for i, (lifetime, lifetime_sd) in enumerate(values["life"]):
+            criticality[i].lifetime = float(lifetime)
+            criticality[i].lifetime_sd = float(lifetime_sd)
+        for i, anecf in enumerate(values["anecf"]):
+            criticality[i].anecf = float(anecf)
+        for i, ealf in enumerate(values["ealf"]):
+            criticality[i].ealf = float(ealf)
+        for i, nubar in enumerate(values["nubar"]):
+            criticality[i].nubar = float(nubar)
+        self.nkeff = len(values["nubar"])
         
-        for match in matches:
-            errors.append(match.group(0).strip())
-            
-        return errors
+        return criticality
     
     def get_summary(self) -> Dict:
         """Get a summary of the parsed output.
@@ -166,14 +196,77 @@ class MCNPOutputParser:
         Returns:
             Dictionary with summary information
         """
-        if not self.parsed_data:
-            self.parse()
+        if self._parsed:
+            has_errors = bool(self.parsed_data.get('errors'))
+            has_warnings = bool(self.parsed_data.get('warnings'))
+            num_tallies = len(self.parsed_data.get('tallies', {}))
+        else:
+            has_errors, has_warnings, num_tallies = self._scan_summary()
             
         summary = {
             'file_path': str(self.filepath),
-            'has_errors': len(self.parsed_data.get('errors', [])) > 0,
-            'has_warnings': len(self.parsed_data.get('warnings', [])) > 0,
-            'num_tallies': len(self.parsed_data.get('tallies', {})),
+            'has_errors': has_errors,
+            'has_warnings': has_warnings,
+            'num_tallies': num_tallies,
         }
         
-        return summary
\ No newline at end of file
+        return summary
+    
+    def _scan_summary(self) -> Tuple[bool, bool, int]:
+        """Scan for only what get_summary reports, without a full parse().
+        
+        The result is kept until the file is read again or parsed.
+        
+        Returns:
+            Whether there are errors and warnings, and the number of tallies
+        """
+        if self._summary is not None:
+            return self._summary
+        if not self.content:
+            self.read_file()
+        
+        has_errors = has_warnings = False
+        tally_numbers = set()
+        for _, lower in self._iter_blocks():
+            # one match is enough; later blocks skip the search
+            has_errors = has_errors or _ERROR_RE.search(lower) is not None
+            has_warnings = has_warnings or _WARNING_RE.search(lower) is not None
+            tally_numbers.update(match.group(1) for match in _TALLY_RE.finditer(lower))
+        self._summary = (has_errors, has_warnings, len(tally_numbers))
+        self._has_errors = has_errors
+        self._has_warnings = has_warnings
+        return self._summary
+    
+    def _contains(self, pattern: re.Pattern) -> bool:
+        """Check if pattern occurs in the output, stopping at the first block with a match."""
+        if not self.content:
+            self.read_file()
+        return any(pattern.search(lower) is not None for _, lower in self._iter_blocks())
+    
+    def has_errors(self) -> bool:
+        """Check if the output reports a fatal error, without a full parse() if not parsed yet."""
+        if self._parsed:
+            return bool(self.parsed_data['errors'])
+        if self._has_errors is None:
+            self._has_errors = self._contains(_ERROR_RE)
+        return self._has_errors
+    
+    def has_warnings(self) -> bool:
+        """Check if the output reports a warning, without a full parse() if not parsed yet."""
+        if self._parsed:
+            return bool(self.parsed_data['warnings'])
+        if self._has_warnings is None:
+            self._has_warnings = self._contains(_WARNING_RE)
+        return self._has_warnings
+    
+    def warning_list(self) -> List[str]:
+        """Get the distinct warning messages, in the order they first appear."""
+        if not self._parsed:
+            self.parse()
+        return list(self.parsed_data['warnings'])
+    
+    def error_list(self) -> List[str]:
+        """Get the distinct fatal error messages, in the order they first appear."""
+        if not self._parsed:
+            self.parse()
+        return list(self.parsed_data['errors'])
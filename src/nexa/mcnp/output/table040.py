@@ -1,7 +1,60 @@
 import re
+import string
+from array import array
 from typing import List, Dict, Optional, Tuple
 from dataclasses import dataclass, field
 
+import numpy as np
+
+# The table is parsed from the lowercased, newline-joined lines; the S(a,b) data set
+# name is sliced from the original text at the same position.
+_SAB_MARKER = "associated thermal s(a,b) data sets:"
+_ISO_PAIR_RE = re.compile(r'(\d+),\s*([\d.e+-]+)')
+# Row patterns start at the newline before the row: a literal first character lets re
+# skip ahead instead of trying '^' at every position.
+# row starting a material: material number followed by the first "ZAID," of its isotopes
+_MATERIAL_ROW_RE = re.compile(r'\n[^\S\n]*(\d+)[^\S\n]+\d+,')
+# rows whose isotopes count: material rows, and continuation rows indented by at least
+# 10 spaces (S(a,b) rows are indented too, but hold table names, never "ZAID," pairs)
+_ISOTOPE_ROW_RE = re.compile(r'\n(?:[^\S\n]*\d+[^\S\n]+\d+,| {10})[^\n]*')
+# length-preserving lowercase for text where str.lower() would shift positions
+_ASCII_LOWER = str.maketrans(string.ascii_uppercase, string.ascii_lowercase)
+# text on a page-eject ('1') line that marks the start of the next output section
+_END_MARKERS = (
+    "probid", "keff results", "run terminated", "neutron creation",
+    "neutron loss", "neutron activity", "weight balance"
+)
+# fraction column value for a fraction the table did not give
+_MISSING = float("nan")
+
+
+def _optional(fraction: float) -> Optional[float]:
+    """Map the missing-fraction marker back to None."""
+    return None if fraction != fraction else fraction
+
+
+def _optional_list(fractions: array) -> List[Optional[float]]:
+    """Convert a fraction column to a list, with None for missing fractions."""
+    return [None if fraction != fraction else fraction for fraction in fractions.tolist()]
+
+
+def _convert_pairs(pairs: List[Tuple[str, str]]) -> Tuple[List[int], List[float]]:
+    """Convert matched (ZAID, fraction) strings to numbers, dropping unparsable pairs."""
+    zaid_strs, fraction_strs = zip(*pairs)
+    try:
+        return list(map(int, zaid_strs)), list(map(float, fraction_strs))
+    except ValueError:
+        # a stray token such as '.' matched the fraction pattern; drop just those pairs
+        zaids, fractions = [], []
+        for zaid_str, fraction_str in pairs:
+            try:
+                fraction = float(fraction_str)
+            except ValueError:
+                continue
+            zaids.append(int(zaid_str))
+            fractions.append(fraction)
+        return zaids, fractions
+
 
 @dataclass
 class IsotopeComposition:
@@ -11,12 +64,64 @@ class IsotopeComposition:
     mass_fraction: Optional[float] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class MaterialComposition:
-    """Data class representing a complete material composition."""
+    """Data class representing a complete material composition.
+    
+    Isotopes are stored column-wise: row i of zaids, atom_fractions and mass_fractions
+    describes one isotope, with NaN for a fraction that was not given.
+    """
     material_number: int
-    isotopes: Dict[int, IsotopeComposition] = field(default_factory=dict)  # zaid -> IsotopeComposition
+    zaids: array = field(default_factory=lambda: array('q'))
+    atom_fractions: array = field(default_factory=lambda: array('d'))
+    mass_fractions: array = field(default_factory=lambda: array('d'))
     thermal_sab_data: Optional[str] = None
+    _rows: Dict[int, int] = field(default_factory=dict, init=False, repr=False, compare=False)  # zaid -> row
+    
+    def _rows_for(self, zaids: List[int]) -> Tuple[List[int], List[int]]:
+        """Get the rows of isotopes, adding rows without fractions for new ones.
+        
+        Returns:
+            The row of each zaid and the zaids that were added
+        """
+        rows = self._rows
+        found = list(map(rows.get, zaids))
+        if None not in found:
+            return found, []
+        
+        added = [zaid for zaid in dict.fromkeys(zaids) if zaid not in rows]
+        start = len(self.zaids)
+        rows.update(zip(added, range(start, start + len(added))))
+        self.zaids.extend(added)
+        blank = array('d', [_MISSING]) * len(added)
+        self.atom_fractions.extend(blank)
+        self.mass_fractions.extend(blank)
+        return list(map(rows.__getitem__, zaids)), added
+    
+    def has_isotope(self, zaid: int) -> bool:
+        """Check if the material contains an isotope."""
+        return zaid in self._rows
+    
+    def get_isotope(self, zaid: int) -> Optional[IsotopeComposition]:
+        """Get an isotope of the material as an IsotopeComposition."""
+        row = self._rows.get(zaid)
+        if row is None:
+            return None
+        return IsotopeComposition(
+            zaid=zaid,
+            atom_fraction=_optional(self.atom_fractions[row]),
+            mass_fraction=_optional(self.mass_fractions[row])
+        )
+    
+    @property
+    def isotopes(self) -> Dict[int, IsotopeComposition]:
+        """zaid -> IsotopeComposition, built from the columns (a copy, not a live view)."""
+        return {
+            zaid: IsotopeComposition(zaid=zaid, atom_fraction=atom, mass_fraction=mass)
+            for zaid, atom, mass in zip(
+                self.zaids.tolist(), _optional_list(self.atom_fractions), _optional_list(self.mass_fractions)
+            )
+        }
 
 
 class Table040Parser:
@@ -27,6 +132,8 @@ class Table040Parser:
         self._header_found = False
         self._current_material = None
         self._parsing_mode = None  # 'atom' or 'mass'
+        self._zaid_to_mats: Dict[int, set] = {}  # zaid -> material numbers containing it
+        self._sab_mats: set = set()  # material numbers with S(a,b) data
     
     def parse_lines(self, lines: List[str]) -> Dict[int, MaterialComposition]:
         """
@@ -39,182 +146,171 @@ class Table040Parser:
             Dictionary mapping material_number -> MaterialComposition
         """
         self.materials.clear()
+        self._zaid_to_mats.clear()
+        self._sab_mats.clear()
         self._header_found = False
         self._current_material = None
         self._parsing_mode = None
         
-        for line in lines:
-            if self._is_table_header(line):
+        text = "\n".join(lines)
+        lower = text.lower()
+        if len(lower) != len(text):
+            # a few non-ASCII characters lowercase to several; keep positions aligned
+            lower = text.translate(_ASCII_LOWER)
+        
+        # Nothing before the first table 40 header matters; without one there is no table
+        first_header = lower.find("print table 40")
+        if first_header < 0:
+            return self.materials
+        
+        # Only header, fraction-type and end-of-table lines change the parser state; they
+        # are found directly and the material rows between them are parsed in bulk
+        section_start = 0
+        stop = len(lower)
+        for start in self._candidate_line_starts(lower, lower.rfind("\n", 0, first_header) + 1):
+            end = lower.find("\n", start)
+            if end < 0:
+                end = len(lower)
+            line = text[start:end]
+            line_lower = lower[start:end]
+            
+            if self._is_table_header(line, line_lower):
+                if self._header_found:
+                    self._parse_section(text, lower, section_start, start)
                 self._header_found = True
                 # Determine if this is atom or mass fraction subtable
-                if "atom fraction" in line.lower():
+                if "atom fraction" in line_lower:
                     self._parsing_mode = "atom"
-                elif "mass fraction" in line.lower():
+                elif "mass fraction" in line_lower:
                     self._parsing_mode = "mass"
+                section_start = end
                 continue
             
             if self._header_found:
-                if self._is_end_of_table(line):
+                if self._is_end_of_table(line, line_lower):
+                    stop = start
                     break
                 
                 # Check for subtable headers
-                if self._is_fraction_type_header(line):
-                    if "atom fraction" in line.lower():
+                if self._is_fraction_type_header(line, line_lower):
+                    self._parse_section(text, lower, section_start, start)
+                    if "atom fraction" in line_lower:
                         self._parsing_mode = "atom"
-                    elif "mass fraction" in line.lower():
+                    elif "mass fraction" in line_lower:
                         self._parsing_mode = "mass"
-                    continue
-                
-                if self._is_material_number_line(line):
-                    material_num = self._extract_material_number(line)
-                    if material_num is not None:
-                        self._current_material = material_num
-                        
-                        # Create material if not exists
-                        if material_num not in self.materials:
-                            self.materials[material_num] = MaterialComposition(material_number=material_num)
-                        
-                        # Parse isotopes on the same line
-                        isotopes = self._parse_isotopes_from_line(line)
-                        self._update_material_isotopes(material_num, isotopes)
-                    continue
-                
-                if self._is_sab_data_line(line):
-                    if self._current_material is not None:
-                        sab_data = self._extract_sab_data(line)
-                        if sab_data:
-                            self.materials[self._current_material].thermal_sab_data = sab_data
-                    continue
-                
-                if self._is_continuation_line(line):
-                    if self._current_material is not None:
-                        isotopes = self._parse_isotopes_from_line(line)
-                        self._update_material_isotopes(self._current_material, isotopes)
-                    continue
+                    section_start = end
         
+        if self._header_found:
+            self._parse_section(text, lower, section_start, stop)
         return self.materials
     
-    def _update_material_isotopes(self, material_num: int, isotopes: List[Tuple[int, float]]):
-        """Update material isotopes with atom or mass fractions."""
-        material = self.materials[material_num]
+    def _candidate_line_starts(self, lower: str, begin: int) -> List[int]:
+        """Get the sorted start offsets of lines from offset begin (a line start) on that
+        may be headers or end the table.
         
-        for zaid, fraction in isotopes:
-            if zaid not in material.isotopes:
-                material.isotopes[zaid] = IsotopeComposition(zaid=zaid)
-            
-            if self._parsing_mode == "atom":
-                material.isotopes[zaid].atom_fraction = fraction
-            elif self._parsing_mode == "mass":
-                material.isotopes[zaid].mass_fraction = fraction
-    
-    def _is_table_header(self, line: str) -> bool:
-        """Check if line contains the table 40 header."""
-        return ("material composition" in line.lower() or 
-                ("material" in line.lower() and ("atom fraction" in line.lower() or "mass fraction" in line.lower()))) and \
-               "print table 40" in line.lower()
-    
-    def _is_end_of_table(self, line: str) -> bool:
-        """Check if line marks the end of the table."""
-        stripped = line.strip()
-        if not stripped:
-            return False
-        
-        # Look for next table or other indicators
-        return ("print table" in line.lower() and "table 40" not in line.lower()) or \
-               line.startswith("1") and any(x in line.lower() for x in [
-                   "probid", "keff results", "run terminated", "neutron creation", 
-                   "neutron loss", "neutron activity", "weight balance"
-               ])
+        Every such line starts with '1' (page eject) or contains 'print table' or 'nuclide'.
+        """
+        starts = set()
+        if lower.startswith("1", begin):
+            starts.add(begin)
+        pos = lower.find("\n1", begin)
+        while pos >= 0:
+            starts.add(pos + 1)
+            pos = lower.find("\n1", pos + 1)
+        for marker in ("print table", "nuclide"):
+            pos = lower.find(marker, begin)
+            while pos >= 0:
+                starts.add(lower.rfind("\n", 0, pos) + 1)
+                pos = lower.find(marker, pos + len(marker))
+        return sorted(starts)
     
-    def _is_fraction_type_header(self, line: str) -> bool:
-        """Check if line is a header indicating fraction type."""
-        return ("component nuclide" in line.lower() and 
-                ("atom fraction" in line.lower() or "mass fraction" in line.lower()))
+    def _parse_section(self, text: str, lower: str, start: int, stop: int):
+        """Parse the material rows of lower[start:stop], all in the current fraction mode."""
+        chunk_start = start
+        for match in _MATERIAL_ROW_RE.finditer(lower, start, stop):
+            self._parse_material_rows(text, lower, chunk_start, match.start())
+            material_num = int(match.group(1))
+            self._current_material = material_num
+            
+            # Create material if not exists
+            if material_num not in self.materials:
+                self.materials[material_num] = MaterialComposition(material_number=material_num)
+            chunk_start = match.start()
+        self._parse_material_rows(text, lower, chunk_start, stop)
     
-    def _is_material_number_line(self, line: str) -> bool:
-        """Check if line starts with a material number."""
-        stripped = line.strip()
-        if not stripped:
-            return False
+    def _parse_material_rows(self, text: str, lower: str, start: int, stop: int):
+        """Parse the rows of the current material in lower[start:stop] in one batch."""
+        material_num = self._current_material
+        if material_num is None:
+            return
         
-        # Look for lines that start with a number followed by isotope data
-        parts = stripped.split()
-        if len(parts) >= 3:
-            # First part should be a number (material number)
-            # Second part should be a ZAID
-            # Third part should be a comma (part of "ZAID,")
-            try:
-                int(parts[0])  # Material number
-                zaid_part = parts[1].rstrip(',')
-                int(zaid_part)  # ZAID
-                return True
-            except ValueError:
-                pass
+        # the leading material number has no comma after it, so it never matches as a ZAID
+        rows = _ISOTOPE_ROW_RE.findall(lower, start, stop)
+        if rows:
+            pairs = _ISO_PAIR_RE.findall("".join(rows))
+            if pairs:
+                zaids, fractions = _convert_pairs(pairs)
+                self._update_material_isotopes(material_num, zaids, fractions)
         
-        return False
-    
-    def _extract_material_number(self, line: str) -> Optional[int]:
-        """Extract material number from the beginning of a line."""
-        parts = line.strip().split()
-        if parts:
-            try:
-                return int(parts[0])
-            except ValueError:
-                pass
-        return None
+        pos = lower.find(_SAB_MARKER, start, stop)
+        while pos >= 0:
+            line_start = lower.rfind("\n", 0, pos) + 1
+            line_end = lower.find("\n", pos, stop)
+            if line_end < 0:
+                line_end = stop
+            # a material row is never an S(a,b) row
+            if not _MATERIAL_ROW_RE.match(lower, line_start - 1):
+                sab_data = self._extract_sab_data(text[line_start:line_end], lower[line_start:line_end])
+                if sab_data:
+                    self.materials[material_num].thermal_sab_data = sab_data
+                    self._sab_mats.add(material_num)
+            pos = lower.find(_SAB_MARKER, line_end, stop)
     
-    def _is_sab_data_line(self, line: str) -> bool:
-        """Check if line contains S(a,b) data information."""
-        return "associated thermal s(a,b) data sets:" in line.lower()
+    def _update_material_isotopes(self, material_num: int, zaids: List[int], fractions: List[float]):
+        """Update material isotopes with atom or mass fractions."""
+        material = self.materials[material_num]
+        rows, added = material._rows_for(zaids)
+        for zaid in added:
+            self._zaid_to_mats.setdefault(zaid, set()).add(material_num)
+        
+        if self._parsing_mode == "atom":
+            column = material.atom_fractions
+        elif self._parsing_mode == "mass":
+            column = material.mass_fractions
+        else:
+            return
+        # scatter through a temporary view; the array must not be resized while it is alive
+        np.frombuffer(column, dtype=np.float64)[rows] = fractions
     
-    def _extract_sab_data(self, line: str) -> Optional[str]:
-        """Extract S(a,b) data set name from line."""
-        match = re.search(r"associated thermal s\(a,b\) data sets:\s*(.+)", line, re.IGNORECASE)
-        if match:
-            return match.group(1).strip()
-        return None
+    def _is_table_header(self, line: str, lower: str) -> bool:
+        """Check if line (lowercased as lower) contains the table 40 header."""
+        if "print table 40" not in lower:
+            return False
+        return ("material composition" in lower or 
+                ("material" in lower and ("atom fraction" in lower or "mass fraction" in lower)))
     
-    def _is_continuation_line(self, line: str) -> bool:
-        """Check if line is a continuation of isotope data."""
+    def _is_end_of_table(self, line: str, lower: str) -> bool:
+        """Check if line (lowercased as lower) marks the end of the table."""
         stripped = line.strip()
         if not stripped:
             return False
         
-        # Check if line starts with whitespace and contains isotope data
-        if line.startswith(' ' * 10):  # Significant indentation
-            # Look for comma-separated ZAID, fraction pairs
-            return ',' in stripped and any(c.isdigit() for c in stripped)
-        
-        return False
+        # Look for next table or other indicators
+        if "print table" in lower and "table 40" not in lower:
+            return True
+        return line.startswith("1") and any(marker in lower for marker in _END_MARKERS)
     
-    def _parse_isotopes_from_line(self, line: str) -> List[Tuple[int, float]]:
-        """Parse isotope compositions from a line."""
-        isotopes = []
-        
-        # Remove material number if present (for first line of material)
-        content = line.strip()
-        parts = content.split()
-        
-        # Skip the first part if it's a material number
-        if parts and self._is_material_number_line(line):
-            parts = parts[1:]  # Skip material number
-        
-        # Rejoin and parse comma-separated pairs
-        content = ' '.join(parts)
-        
-        # Use regex to find ZAID, fraction pairs
-        pattern = r'(\d+),\s*([\d.E+-]+)'
-        matches = re.findall(pattern, content)
-        
-        for zaid_str, fraction_str in matches:
-            try:
-                zaid = int(zaid_str)
-                fraction = float(fraction_str)
-                isotopes.append((zaid, fraction))
-            except ValueError:
-                continue
-        
-        return isotopes
+    def _is_fraction_type_header(self, line: str, lower: str) -> bool:
+        """Check if line (lowercased as lower) is a header indicating fraction type."""
+        return ("component nuclide" in lower and 
+                ("atom fraction" in lower or "mass fraction" in lower))
+    
+    def _extract_sab_data(self, line: str, lower: str) -> Optional[str]:
+        """Extract S(a,b) data set name from line (lowercased as lower)."""
+        start = lower.find(_SAB_MARKER)
+        if start < 0:
+            return None
+        return line[start + len(_SAB_MARKER):].strip() or None
     
     def get_material_composition(self, material_number: int) -> Optional[MaterialComposition]:
         """Get composition for a specific material."""
@@ -225,26 +321,19 @@ class Table040Parser:
         return sorted(list(self.materials.keys()))
     
     def get_materials_with_sab_data(self) -> List[int]:
-        """Get list of materials that have associated S(a,b) data."""
-        return [
-            mat_num for mat_num, composition in self.materials.items()
-            if composition.thermal_sab_data is not None
-        ]
+        """Get sorted list of materials that have associated S(a,b) data."""
+        return sorted(self._sab_mats)
     
     def get_isotope_in_material(self, material_number: int, zaid: int) -> Optional[IsotopeComposition]:
         """Get specific isotope data for a material."""
         material = self.get_material_composition(material_number)
         if material:
-            return material.isotopes.get(zaid)
+            return material.get_isotope(zaid)
         return None
     
     def get_materials_with_isotope(self, zaid: int) -> List[int]:
         """Get list of materials that contain a specific isotope."""
-        result = []
-        for mat_num, composition in self.materials.items():
-            if zaid in composition.isotopes:
-                result.append(mat_num)
-        return sorted(result)
+        return sorted(self._zaid_to_mats.get(zaid, ()))
     
     def get_isotope_atom_fraction(self, material_number: int, zaid: int) -> Optional[float]:
         """Get atom fraction for a specific isotope in a material."""
@@ -264,11 +353,15 @@ class Table040Parser:
                     'material_number': composition.material_number,
                     'isotopes': {
                         zaid: {
-                            'zaid': isotope.zaid,
-                            'atom_fraction': isotope.atom_fraction,
-                            'mass_fraction': isotope.mass_fraction
+                            'zaid': zaid,
+                            'atom_fraction': atom,
+                            'mass_fraction': mass
                         }
-                        for zaid, isotope in composition.isotopes.items()
+                        for zaid, atom, mass in zip(
+                            composition.zaids.tolist(),
+                            _optional_list(composition.atom_fractions),
+                            _optional_list(composition.mass_fractions)
+                        )
                     },
                     'thermal_sab_data': composition.thermal_sab_data
                 }
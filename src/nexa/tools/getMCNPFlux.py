@@ -25,9 +25,7 @@ def main():
     args = parser.parse_args()
 
     try:
-        with open(args.file, "r", encoding="utf-8") as f:
-            print(f"Processing file: {args.file}")
-            lines = f.readlines()
+        f = open(args.file, "r", encoding="utf-8")
     except FileNotFoundError:
         print(f"File not found: {args.file}")
         sys.exit(1)
@@ -36,13 +34,15 @@ def main():
         sys.exit(1)
 
     parser = MctalParser()
-    mctal: MctalOverview = parser.parse_lines(lines)
+    with f:
+        print(f"Processing file: {args.file}")
+        mctal: MctalOverview = parser.parse_iter(f)
     mctal.case = Path(args.file).stem[:-1] # remove trailing m
     print(mctal)
     for tal_num in mctal.tally_nums:
         tal = mctal.tallies.get(tal_num, None)
         if tal:
-            print(f"Tally {tal.tally_num} has {len(tal.vals_data)} VALS entries")
+            print(f"Tally {tal.tally_num} has {len(tal.vals)} VALS entries")
             print(f"value at tfc bin {tal.tfc_bin}: {tal.value(tal.tfc_bin)}")
 
     # 'F', 'D', 'U', 'S', 'M', 'C', 'E', 'T'
@@ -79,7 +79,7 @@ def main():
             nper = 6
             it = tal.iterator()
             free = ["F", "E"]
-            iter_gen = it.iter_coords(free, fixed, format="tuple")
+            coord = tal.compiled_coord_fn(free, fixed)
 
             for f in range(it.sizes["F"]):
                 case_name = f"{case_series}{case_index:02d}b{case_step:02d}z{f+1:02d}d{case_depl}Flux"
@@ -87,8 +87,7 @@ def main():
                     flux = []
                     # open output file
                     for e in range(it.sizes["E"]):
-                        coord = next(iter_gen)
-                        flux.append(tal.value(coord)[0])  # get flux value
+                        flux.append(tal.value(coord(f, e))[0])  # get flux value
                     line = "    "
                     for bin, val in enumerate(reversed(flux)):
                         if bin == 0: